@@ -1,16 +1,16 @@
 """The Allowance Calculator integration."""
-import asyncio
-import datetime
 import logging
-from typing import Any, Dict
+import time
+from typing import Any, Callable, Dict, List, Tuple
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.const import Platform, CONF_NAME, CONF_CURRENCY
+from homeassistant.const import Platform, CONF_NAME, CONF_CURRENCY, STATE_UNAVAILABLE
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers import event
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.exceptions import HomeAssistantError
 
 from .const import (
@@ -18,18 +18,47 @@ from .const import (
     CONF_CHILDREN,
     CONF_BIRTHDAY,
     CONF_PERCENTAGE,
+    CONF_MIN_AGE,
+    CONF_BRACKETS,
+    CONF_STEP,
+    CONF_CAP,
+    CONF_OVERRIDES,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_EXCLUDE_VOLATILE_ATTRIBUTES,
+    CONF_SLICE_BUDGET_MS,
+    CONF_OFFLOAD_TO_EXECUTOR,
     DEFAULT_PERCENTAGE,
     DEFAULT_CURRENCY,
+    DEFAULT_SLICE_BUDGET_MS,
+    MAX_PERCENTAGE,
+    MIN_AGE_FOR_ALLOWANCE,
+    MIN_PERCENTAGE,
+    SIGNAL_CHILDREN_ADDED,
     SUPPORTED_CURRENCIES,
 )
-from .calculator import get_child_allowance_data, format_allowance
+from .calculator import format_allowance
+from .coordinator import AllowanceCoordinator
+from .ledger import PayoutLedger
+from .models import ChildProfile, build_profiles
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
+
 CHILD_SCHEMA = vol.Schema({
     vol.Required(CONF_NAME): cv.string,
     vol.Required(CONF_BIRTHDAY): cv.string,
     vol.Optional(CONF_PERCENTAGE, default=DEFAULT_PERCENTAGE): vol.Coerce(float),
+    vol.Optional(CONF_MIN_AGE, default=MIN_AGE_FOR_ALLOWANCE): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional(CONF_BRACKETS, default={}): {
+        vol.All(vol.Coerce(int), vol.Range(min=0)):
+            vol.All(vol.Coerce(float), vol.Range(min=MIN_PERCENTAGE, max=MAX_PERCENTAGE)),
+    },
+    vol.Optional(CONF_STEP, default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(CONF_CAP): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(CONF_OVERRIDES, default={}): {
+        vol.All(vol.Coerce(int), vol.Range(min=0)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    },
 })
 
 CONFIG_SCHEMA = vol.Schema({
@@ -43,6 +72,8 @@ PLATFORMS = [Platform.SENSOR]
 
 async def async_setup(hass: HomeAssistant, config: Dict[str, Any]) -> bool:
     """Set up the Allowance Calculator component."""
+    async_setup_services(hass)
+    
     if DOMAIN not in config:
         return True
 
@@ -50,91 +81,209 @@ async def async_setup(hass: HomeAssistant, config: Dict[str, Any]) -> bool:
     children = domain_config[CONF_CHILDREN]
     currency = domain_config.get(CONF_CURRENCY, DEFAULT_CURRENCY)
 
+    # Only YAML setups announce birthdays, so the notifier is loaded here
+    from .notifications import BirthdayNotifier
+    
+    profiles = build_profiles(children)
+    coordinator = AllowanceCoordinator(hass, profiles, currency)
+    notifier = BirthdayNotifier(hass, currency)
+    await notifier.async_load()
+
     hass.data[DOMAIN] = {
         "children": children,
+        "profiles": profiles,
         "currency": currency,
+        "coordinator": coordinator,
     }
 
-    async def update_allowances(now=None):
-        """Update allowances for all children."""
-        if now is None:
-            now = datetime.datetime.now()
-        
-        current_date = now.date()
+    birthdays: List[Tuple[ChildProfile, Dict[str, Any]]] = []
+    
+    def child_listener(profile: ChildProfile) -> Callable[[], None]:
+        """Return a listener that updates a single child's state."""
+        entity_id = f"sensor.{profile.slug}_allowance"
         
-        for child in children:
-            child_data = get_child_allowance_data(child, current_date)
-            name = child_data["name"]
-            allowance = child_data["allowance"]
+        @callback
+        def update_allowance():
+            """Update the child's allowance state, unless it is unchanged."""
+            child_data = coordinator.data.get(profile.slug)
+            if child_data is None:
+                return
             
-            # Update state
-            hass.states.async_set(
-                f"sensor.{name.lower()}_allowance",
-                allowance,
-                {
-                    "friendly_name": f"{name}'s Allowance",
-                    "unit_of_measurement": currency,
-                    "formatted_value": format_allowance(allowance, currency),
-                    "age": child_data["age"],
-                    "percentage": child.get(CONF_PERCENTAGE, DEFAULT_PERCENTAGE),
-                }
-            )
+            allowance = child_data["allowance"]
+            attributes = {
+                "friendly_name": f"{profile.name}'s Allowance",
+                "unit_of_measurement": currency,
+                "formatted_value": format_allowance(allowance, currency),
+                "age": child_data["age"],
+                "percentage": profile.percentage,
+            }
+            # The data of a failed update is stale, like the config entry sensors show
+            value = str(allowance) if coordinator.last_update_success else STATE_UNAVAILABLE
+            state = hass.states.get(entity_id)
+            if state is not None and state.state == value and state.attributes == attributes:
+                coordinator.async_record_state_write(False)
+            else:
+                hass.states.async_set(entity_id, value, attributes)
+                coordinator.async_record_state_write(True)
             
-            # Check if it's the child's birthday
-            if child_data["is_birthday"]:
-                new_allowance = child_data["next_allowance"]
-                _LOGGER.info(f"It's {name}'s birthday! New allowance: {format_allowance(new_allowance, currency)}")
-                
-                hass.components.persistent_notification.async_create(
-                    f"It's {name}'s birthday! New weekly allowance: {format_allowance(new_allowance, currency)}",
-                    title=f"Allowance Update for {name}"
-                )
-
-    # Schedule daily updates at midnight
-    @callback
-    def schedule_midnight_update(now=None):
-        """Schedule next update at midnight."""
-        today = datetime.datetime.now().date()
-        tomorrow = today + datetime.timedelta(days=1)
-        next_midnight = datetime.datetime.combine(tomorrow, datetime.time())
-        
-        event.async_track_point_in_time(
-            hass, 
-            lambda x: asyncio.create_task(update_allowances(x)),
-            next_midnight
-        )
+            # Collect the children whose birthday it is
+            if coordinator.last_update_success and child_data["is_birthday"]:
+                birthdays.append((profile, child_data))
         
-        # Also schedule the next update
-        event.async_track_point_in_time(
-            hass,
-            schedule_midnight_update,
-            next_midnight
-        )
-
-    # Initial update
-    await update_allowances()
+        return update_allowance
     
-    # Schedule the first midnight update
-    schedule_midnight_update()
+    @callback
+    def announce_birthdays():
+        """Announce the birthdays collected by the child listeners."""
+        if birthdays:
+            notifier.async_announce(coordinator.current_date, list(birthdays))
+            birthdays.clear()
+
+    # Go through the same coordinator as config entries, which owns the
+    # single midnight timer in Home Assistant's time zone
+    # One listener per child lets the midnight update spread the state
+    # writes over several slices; the birthdays are announced last
+    for profile in profiles:
+        coordinator.async_add_listener(child_listener(profile))
+    coordinator.async_add_listener(announce_birthdays)
+    await coordinator.async_refresh()
+    coordinator.async_start()
+    await coordinator.async_register_shutdown()
     
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Allowance Calculator from a config entry."""
+    coordinator = AllowanceCoordinator(hass, build_profiles(_entry_children(entry)), _entry_currency(entry))
+    coordinator.recorder_options = _recorder_options(entry)
+    _apply_scheduler_options(coordinator, entry)
+    coordinator.ledger = PayoutLedger(hass, entry.entry_id)
+    await coordinator.ledger.async_load()
+    await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(coordinator.async_start())
+    
+    if entry.options.get(CONF_LONG_TERM_STATISTICS, False):
+        if "recorder" in hass.config.components:
+            # Only load the recorder's statistics API when it is used
+            from .long_term_statistics import StatisticsPublisher
+            
+            publisher = StatisticsPublisher(hass, coordinator)
+            entry.async_on_unload(coordinator.async_add_listener(publisher.async_schedule_publish))
+            publisher.async_schedule_publish()
+        else:
+            _LOGGER.warning("Long-term statistics need the recorder, which is not set up")
+    
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = entry.data
+    hass.data[DOMAIN][entry.entry_id] = coordinator
     
+    _async_migrate_device_identifiers(hass, entry, coordinator.profiles)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
     
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options in place, only touching the children that changed."""
+    coordinator: AllowanceCoordinator = hass.data[DOMAIN][entry.entry_id]
+    
+    # The recorder options decide which entities and listeners exist
+    if _recorder_options(entry) != coordinator.recorder_options:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    
+    _apply_scheduler_options(coordinator, entry)
+    start = time.perf_counter()
+    profiles = build_profiles(_entry_children(entry))
+    slugs = {profile.slug for profile in profiles}
+    previous_slugs = {profile.slug for profile in coordinator.profiles}
+    
+    coordinator.async_set_profiles(profiles, _entry_currency(entry))
+    
+    for slug in previous_slugs - slugs:
+        _async_remove_child_entities(hass, slug)
+    added = [profile for profile in profiles if profile.slug not in previous_slugs]
+    if added:
+        async_dispatcher_send(hass, SIGNAL_CHILDREN_ADDED.format(entry.entry_id), added)
+    
+    _LOGGER.debug(
+        f"Applied options in {(time.perf_counter() - start) * 1000:.1f} ms: "
+        f"{coordinator.stats.children_recomputed} children recomputed, "
+        f"{len(added)} added, {len(previous_slugs - slugs)} removed"
+    )
+
+
+@callback
+def _async_migrate_device_identifiers(
+    hass: HomeAssistant, entry: ConfigEntry, profiles: List[ChildProfile]
+) -> None:
+    """Move devices identified by the old slug, which only replaced spaces, to the child's slug."""
+    device_registry = dr.async_get(hass)
+    for profile in profiles:
+        old_identifier = f"{entry.entry_id}_{profile.name.lower().replace(' ', '_')}"
+        new_identifier = f"{entry.entry_id}_{profile.slug}"
+        if old_identifier == new_identifier:
+            continue
+        device = device_registry.async_get_device(identifiers={(DOMAIN, old_identifier)})
+        if device is not None:
+            device_registry.async_update_device(device.id, new_identifiers={(DOMAIN, new_identifier)})
+
+
+@callback
+def _async_remove_child_entities(hass: HomeAssistant, slug: str) -> None:
+    """Remove a child's sensors and their device."""
+    entity_registry = er.async_get(hass)
+    device_ids = set()
+    for unique_id in (f"allowance_{slug}", f"birthday_countdown_{slug}"):
+        entity_id = entity_registry.async_get_entity_id(Platform.SENSOR, DOMAIN, unique_id)
+        if entity_id is None:
+            continue
+        device_id = entity_registry.async_get(entity_id).device_id
+        if device_id is not None:
+            device_ids.add(device_id)
+        entity_registry.async_remove(entity_id)
+    
+    device_registry = dr.async_get(hass)
+    for device_id in device_ids:
+        device_registry.async_remove_device(device_id)
+
+
+def _entry_children(entry: ConfigEntry) -> List[Dict[str, Any]]:
+    """Return an entry's children, as last changed through the options."""
+    return entry.options.get(CONF_CHILDREN, entry.data.get(CONF_CHILDREN, []))
+
+
+def _entry_currency(entry: ConfigEntry) -> str:
+    """Return an entry's currency, as last changed through the options."""
+    return entry.options.get(CONF_CURRENCY, entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY))
+
+
+def _apply_scheduler_options(coordinator: AllowanceCoordinator, entry: ConfigEntry) -> None:
+    """Apply the options that decide how updates share the event loop."""
+    coordinator.scheduler.budget_ms = entry.options.get(CONF_SLICE_BUDGET_MS, DEFAULT_SLICE_BUDGET_MS)
+    coordinator.scheduler.use_executor = entry.options.get(CONF_OFFLOAD_TO_EXECUTOR, False)
+
+
+def _recorder_options(entry: ConfigEntry) -> Tuple[bool, bool]:
+    """Return the options that change what is recorded."""
+    return (
+        entry.options.get(CONF_LONG_TERM_STATISTICS, False),
+        entry.options.get(CONF_EXCLUDE_VOLATILE_ATTRIBUTES, False),
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.ledger.async_flush()
     
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the payout ledger of a removed config entry."""
+    await PayoutLedger(hass, entry.entry_id).async_remove()
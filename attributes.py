@@ -0,0 +1,14 @@
+"""Shared strings for the state attributes of the Allowance Calculator integration."""
+import datetime
+import functools
+from typing import Tuple
+
+from .const import FORMAT_CACHE_SIZE
+
+
+# Next birthdays fall on one of a few hundred dates, so every sensor whose
+# birthday is on the same day shares the same strings.
+@functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def date_strings(date: datetime.date) -> Tuple[str, str]:
+    """Return a date as YYYY-MM-DD and its weekday name."""
+    return date.strftime("%Y-%m-%d"), date.strftime("%A")
@@ -0,0 +1,94 @@
+"""Run the benchmarks and compare them with the stored baseline.
+
+    python -m benchmarks                    # fails when a result regressed
+    python -m benchmarks --update-baseline  # stores the results as the new baseline
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from .cases import batch_results, roster_results, scalar_results
+from .imports import import_results
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+SIZES = (10, 1000, 50000)
+
+# Hard limits in ms, whatever the baseline says. Importing NumPy at import
+# time alone takes longer than these.
+BUDGETS = {
+    "import.wall_ms": 25.0,
+    "import.first_setup.10.wall_ms": 50.0,
+}
+
+# How much worse than the baseline a result may be, by the unit of its name.
+# Times vary a lot between machines and runs, allocations and writes don't.
+TOLERANCES = {
+    "_ns": 1.0,
+    "_ms": 1.0,
+    "_kib": 0.2,
+    "writes": 0.0,
+}
+
+
+def _tolerance(name: str) -> float:
+    """Return the allowed regression of a result."""
+    for suffix, tolerance in TOLERANCES.items():
+        if name.endswith(suffix):
+            return tolerance
+    raise ValueError(f"No tolerance for {name}")
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float]) -> List[str]:
+    """Return the results that regressed against the baseline or exceed their budget."""
+    regressions = []
+    for name, value in results.items():
+        if name in BUDGETS and value > BUDGETS[name]:
+            regressions.append(f"{name}: {value:.1f} > {BUDGETS[name]:.1f} (budget)")
+        if name not in baseline:
+            continue
+        limit = baseline[name] * (1 + _tolerance(name))
+        if value > limit:
+            regressions.append(f"{name}: {value:.1f} > {limit:.1f} (baseline {baseline[name]:.1f})")
+    return regressions
+
+
+def main() -> int:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the baseline")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=SIZES, help="roster sizes to set up and update"
+    )
+    args = parser.parse_args()
+
+    results = import_results()
+    results.update(scalar_results())
+    for size in args.sizes:
+        results.update(roster_results(size))
+    results.update(batch_results())
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    for name, value in results.items():
+        reference = baseline.get(name)
+        reference_text = "" if reference is None else f"  (baseline {reference:.1f})"
+        print(f"{name:<40} {value:>12.1f}{reference_text}")
+
+    if args.update_baseline:
+        baseline.update({name: round(value, 1) for name, value in results.items()})
+        BASELINE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {BASELINE}")
+        return 0
+
+    regressions = compare(results, baseline)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""Benchmark cases for the calculator and the sensor hot paths."""
+import asyncio
+import datetime
+import gc
+import time
+import timeit
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from . import load_module
+
+# Fixed so runs are comparable from day to day
+REFERENCE_DATE = datetime.date(2026, 3, 2)
+SCALAR_CALLS = 20000
+REPEATS = 5
+# Child-days of the batch calculation and how they are split into (children, days)
+BATCH_SHAPES = {
+    10000: (10000, 1),
+    1000000: (1000, 1000),
+}
+
+
+class StubHass:
+    """The parts of Home Assistant the coordinator and sensors touch outside an entity platform."""
+
+    def __init__(self):
+        """Initialize the stub."""
+        self.data: Dict[str, Any] = {}
+
+
+def roster(size: int) -> List[Dict[str, Any]]:
+    """Return the config of a roster with the given number of children."""
+    return [
+        {
+            "name": f"Kid {index}",
+            "birthday": f"{2005 + index % 15}-{1 + index % 12:02d}-{1 + index % 28:02d}",
+            "percentage": 20 + index % 3 * 10,
+        }
+        for index in range(size)
+    ]
+
+
+def _best_ns(func: Callable[[], Any], calls: int) -> float:
+    """Return the best time per call in nanoseconds."""
+    return min(timeit.repeat(func, number=calls, repeat=REPEATS)) / calls * 1e9
+
+
+def scalar_results() -> Dict[str, float]:
+    """Time the scalar calculator functions."""
+    calculator = load_module("calculator")
+    models = load_module("models")
+    profile = models.build_profiles(roster(1))[0]
+    birthday = profile.birthday
+
+    return {
+        "scalar.calculate_age_ns": _best_ns(
+            lambda: calculator.calculate_age(birthday, REFERENCE_DATE), SCALAR_CALLS
+        ),
+        "scalar.schedule_allowance_ns": _best_ns(
+            lambda: profile.schedule.allowance(11), SCALAR_CALLS
+        ),
+        "scalar.get_child_allowance_data_ns": _best_ns(
+            lambda: calculator.get_child_allowance_data(profile, REFERENCE_DATE), SCALAR_CALLS
+        ),
+        "scalar.format_allowance_ns": _best_ns(
+            lambda: calculator.format_allowance(3.3, "EUR"), SCALAR_CALLS
+        ),
+    }
+
+
+class Installation:
+    """A coordinator and its child sensors, set up the way a config entry does it."""
+
+    def __init__(self, size: int):
+        """Initialize the installation."""
+        self.size = size
+        self.coordinator = None
+        self.entities: List[Any] = []
+
+    async def async_setup(self) -> None:
+        """Build the profiles, compute the first day and create the sensors."""
+        coordinator_module = load_module("coordinator")
+        models = load_module("models")
+        sensor = load_module("sensor")
+
+        profiles = models.build_profiles(roster(self.size))
+        self.coordinator = coordinator_module.AllowanceCoordinator(StubHass(), profiles, "EUR")
+        self.coordinator.data = await self.coordinator._async_compute(REFERENCE_DATE)
+        sensor._async_add_child_sensors(
+            self.coordinator, profiles, sensor.AllowanceSensor, "benchmark", self.entities.extend
+        )
+        for entity in self.entities:
+            # Stands in for the state machine, the writes are counted by the coordinator
+            entity.async_write_ha_state = _no_write
+            self.coordinator.async_add_listener(entity._handle_coordinator_update)
+
+    async def async_next_day(self) -> None:
+        """Run the midnight update for the next day."""
+        coordinator = self.coordinator
+        await coordinator._async_midnight_update(coordinator.current_date + datetime.timedelta(days=1))
+
+    async def async_refresh(self) -> None:
+        """Notify all sensors without any change, like after a payout."""
+        self.coordinator.async_update_listeners()
+
+
+def _no_write() -> None:
+    """Skip the state write."""
+
+
+def _measure(make: Callable[[], Awaitable[Any]], repeats: int) -> Tuple[float, float]:
+    """Run a coroutine, returning the best wall time in ms and the traced peak in KiB."""
+    duration_ms = float("inf")
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        asyncio.run(make())
+        duration_ms = min(duration_ms, (time.perf_counter() - start) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        asyncio.run(make())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return duration_ms, peak / 1024
+
+
+def roster_results(size: int) -> Dict[str, float]:
+    """Time the setup and the update cycles for a roster."""
+    results: Dict[str, float] = {}
+    # Large rosters take long enough to be stable in one run
+    repeats = REPEATS if size <= 1000 else 1
+    for name in ("models", "coordinator", "sensor"):
+        load_module(name)
+
+    async def setup() -> None:
+        await Installation(size).async_setup()
+
+    results[f"setup.{size}.wall_ms"], results[f"setup.{size}.peak_kib"] = _measure(setup, repeats)
+
+    for cycle in ("next_day", "refresh"):
+        installations: List[Installation] = []
+
+        async def prepare() -> None:
+            installation = Installation(size)
+            await installation.async_setup()
+            installations.append(installation)
+
+        # A fresh installation for every timed run and for the traced one
+        for _ in range(repeats + 1):
+            asyncio.run(prepare())
+
+        async def run() -> None:
+            installation = installations.pop()
+            await getattr(installation, f"async_{cycle}")()
+            results[f"{cycle}.{size}.writes"] = installation.coordinator.stats.state_writes
+
+        results[f"{cycle}.{size}.wall_ms"], results[f"{cycle}.{size}.peak_kib"] = _measure(run, repeats)
+
+    return results
+
+
+def batch_results() -> Dict[str, float]:
+    """Time the Python and the NumPy path of the batch calculation."""
+    calculator = load_module("calculator")
+    models = load_module("models")
+    paths = {"python": calculator._calculate_allowance_batch_python}
+    if calculator._numpy() is not None:
+        paths["numpy"] = calculator._calculate_allowance_batch_numpy
+
+    results: Dict[str, float] = {}
+    for child_days, (children, days) in BATCH_SHAPES.items():
+        profiles = models.build_profiles(roster(children))
+        dates = [REFERENCE_DATE + datetime.timedelta(days=offset) for offset in range(days)]
+        # The Python path takes seconds for a million child-days
+        repeats = REPEATS if child_days <= 10000 else 1
+        for path, func in paths.items():
+            gc.collect()
+            best = min(timeit.repeat(lambda: func(profiles, dates), number=1, repeat=repeats))
+            results[f"batch.{child_days}.{path}_ms"] = best * 1000
+    return results
@@ -0,0 +1,67 @@
+"""Import and first setup time of the integration in a fresh process."""
+import json
+import subprocess
+import sys
+from typing import Dict, List
+
+from . import PACKAGE, ROOT
+from .cases import REPEATS
+
+# Home Assistant has loaded these long before it imports a custom integration
+PRELOADED = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.persistent_notification",
+)
+
+SCRIPT = f"""
+import asyncio, json, sys, time
+{"; ".join(f"import {module}" for module in PRELOADED)}
+from benchmarks import load_integration
+before = set(sys.modules)
+load_integration()
+loaded = sorted(name for name in ("numpy",) if name in sys.modules and name not in before)
+from benchmarks.cases import Installation
+start = time.perf_counter()
+asyncio.run(Installation(10).async_setup())
+print(json.dumps({{"setup_ms": (time.perf_counter() - start) * 1000, "loaded": loaded}}))
+"""
+
+
+def _cumulative_us(importtime: str) -> int:
+    """Return the cumulative import time of the package from python -X importtime."""
+    for line in importtime.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == PACKAGE:
+            return int(fields[1])
+    raise ValueError(f"{PACKAGE} not found in the import times")
+
+
+def import_results() -> Dict[str, float]:
+    """Time the import and the first setup of 10 children, best of several processes."""
+    import_ms: List[float] = []
+    setup_ms: List[float] = []
+    for _ in range(REPEATS):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SCRIPT],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(process.stdout.splitlines()[-1])
+        if result["loaded"]:
+            raise RuntimeError(f"Importing the integration loaded {', '.join(result['loaded'])}")
+        import_ms.append(_cumulative_us(process.stderr) / 1000)
+        setup_ms.append(result["setup_ms"])
+
+    return {
+        "import.wall_ms": min(import_ms),
+        "import.first_setup.10.wall_ms": min(setup_ms),
+    }
@@ -1,7 +1,18 @@
 """Allowance calculation logic."""
 import datetime
-from typing import Tuple, Dict, Any
-from .const import MIN_AGE_FOR_ALLOWANCE
+import functools
+from typing import Tuple, Dict, Any, Iterable, Iterator, List, NamedTuple, Sequence, Union, TYPE_CHECKING
+from .const import (
+    EARNINGS_CACHE_SIZE,
+    FORMAT_CACHE_SIZE,
+    PAYDAY_WEEKDAY,
+    PROJECTION_AGE,
+    SUPPORTED_CURRENCIES,
+)
+
+if TYPE_CHECKING:
+    from .models import ChildProfile
+    from .rules import AllowanceTable
 
 
 def calculate_age(birthday: datetime.date, reference_date: datetime.date = None) -> int:
@@ -20,67 +31,398 @@ def calculate_age(birthday: datetime.date, reference_date: datetime.date = None)
     return max(0, age)
 
 
-def calculate_allowance(age: int, percentage: float = 30) -> float:
-    """Calculate allowance based on age and percentage."""
-    if age < MIN_AGE_FOR_ALLOWANCE:
-        return 0.0
-    
-    # Ensure percentage is within valid range
-    percentage = max(0, min(100, percentage))
-    
-    return round(age * percentage / 100, 2)
-
-
 def get_child_allowance_data(
-    child_config: Dict[str, Any], current_date: datetime.date = None
+    profile: "ChildProfile",
+    current_date: datetime.date = None,
+    calendar: "BirthdayCalendar" = None,
 ) -> Dict[str, Any]:
-    """Calculate allowance data for a child."""
+    """Calculate allowance data for a child, looking up the next birthday in calendar if given."""
     if current_date is None:
         current_date = datetime.datetime.now().date()
     
-    name = child_config["name"]
-    birthday = datetime.datetime.strptime(child_config["birthday"], "%Y-%m-%d").date()
-    percentage = child_config.get("percentage", 30)
+    birthday = profile.birthday
+    percentage = profile.percentage
     
     age = calculate_age(birthday, current_date)
-    allowance = calculate_allowance(age, percentage)
-    is_birthday_today = is_birthday(birthday, current_date)
+    allowance = profile.schedule.allowance(age)
     
     # Calculate next allowance (what they'll get after next birthday)
     next_age = age + 1
-    next_allowance = calculate_allowance(next_age, percentage)
+    next_allowance = profile.schedule.allowance(next_age)
+    if calendar is not None and calendar.year == current_date.year:
+        next_birthday_date = calendar.next_birthday(profile, current_date)
+    else:
+        next_birthday_date = next_birthday(birthday, current_date)
     
     return {
-        "name": name,
+        "name": profile.name,
         "age": age,
         "allowance": allowance,
-        "is_birthday": is_birthday_today,
+        # Leap-day birthdays are celebrated on March 1 in common years
+        "is_birthday": next_birthday_date == current_date,
         "next_age": next_age,
         "next_allowance": next_allowance,
         "percentage": percentage,
-        "birthday": birthday.strftime("%Y-%m-%d"),
+        "birthday": profile.birthday_iso,
+        "next_birthday": next_birthday_date,
+        "days_until_birthday": (next_birthday_date - current_date).days,
+        **get_child_earnings_data(profile, current_date),
     }
 
 
-def format_allowance(amount: float, currency: str = "EUR") -> str:
-    """Format allowance with currency symbol."""
-    from .const import SUPPORTED_CURRENCIES
+def get_child_earnings_data(
+    profile: "ChildProfile", current_date: datetime.date = None
+) -> Dict[str, float]:
+    """Calculate what a child has earned and will earn until PROJECTION_AGE."""
+    if current_date is None:
+        current_date = datetime.datetime.now().date()
     
-    currency_info = SUPPORTED_CURRENCIES.get(currency, SUPPORTED_CURRENCIES["EUR"])
-    symbol = currency_info["symbol"]
+    birthday = profile.birthday
+    earned = _earned_before(profile, current_date + datetime.timedelta(days=1))
+    earned_last_year = _earned_before(profile, datetime.date(current_date.year, 1, 1))
+    earned_until_18 = _earned_before(
+        profile, birthday_in_year(birthday, birthday.year + PROJECTION_AGE)
+    )
     
+    return {
+        "total_earned": round(earned, 2),
+        "earned_this_year": round(earned - earned_last_year, 2),
+        "projected_until_18": round(max(0.0, earned_until_18 - earned), 2),
+    }
+
+
+def calculate_earnings(
+    profile: "ChildProfile", start: datetime.date, end: datetime.date
+) -> float:
+    """Calculate what a child is paid on the paydays from start up to, not including, end.
+
+    Rather than walking every week, this takes the difference of what was
+    earned before each date, which is a lookup of the earnings until the last
+    birthday plus the paydays since.
+    """
+    if end <= start:
+        return 0.0
+    return round(max(0.0, _earned_before(profile, end) - _earned_before(profile, start)), 2)
+
+
+def _earned_before(profile: "ChildProfile", date: datetime.date) -> float:
+    """Calculate what a child is paid from birth up to, not including, date."""
+    birthday = profile.birthday
+    if date <= birthday:
+        return 0.0
+    
+    age = calculate_age(birthday, date)
+    totals = _earnings_by_age(profile.schedule, birthday, max(age, PROJECTION_AGE) + 1)
+    since_birthday = count_paydays(birthday_in_year(birthday, birthday.year + age), date)
+    return totals[age] + since_birthday * profile.schedule.allowance(age)
+
+
+@functools.lru_cache(maxsize=EARNINGS_CACHE_SIZE)
+def _earnings_by_age(schedule: "AllowanceTable", birthday: datetime.date, ages: int) -> Tuple[float, ...]:
+    """Return what is paid from birth up to each of the first ages birthdays."""
+    totals = [0.0]
+    for age in range(ages - 1):
+        paydays = count_paydays(
+            birthday_in_year(birthday, birthday.year + age),
+            birthday_in_year(birthday, birthday.year + age + 1),
+        )
+        totals.append(totals[-1] + paydays * schedule.allowance(age))
+    return tuple(totals)
+
+
+def iter_paydays(
+    profile: "ChildProfile", start: datetime.date, end: datetime.date
+) -> Iterator[Tuple[datetime.date, float]]:
+    """Yield each payday from start up to, not including, end with the allowance paid."""
+    week = datetime.timedelta(days=7)
+    for age, period_start, period_end in age_periods(profile, start, end):
+        amount = profile.schedule.allowance(age)
+        payday = period_start + datetime.timedelta(
+            days=(PAYDAY_WEEKDAY - period_start.weekday()) % 7
+        )
+        while payday < period_end:
+            yield payday, amount
+            payday += week
+
+
+def age_periods(
+    profile: "ChildProfile", start: datetime.date, end: datetime.date
+) -> Iterator[Tuple[int, datetime.date, datetime.date]]:
+    """Split the dates from start up to, not including, end by the child's age."""
+    birthday = profile.birthday
+    start = max(start, birthday)
+    if end <= start:
+        return
+    
+    age = calculate_age(birthday, start)
+    while True:
+        period_start = max(start, birthday_in_year(birthday, birthday.year + age))
+        period_end = min(end, birthday_in_year(birthday, birthday.year + age + 1))
+        yield age, period_start, period_end
+        if period_end >= end:
+            break
+        age += 1
+
+
+def count_paydays(
+    start: datetime.date, end: datetime.date, weekday: int = PAYDAY_WEEKDAY
+) -> int:
+    """Count the paydays from start up to, not including, end."""
+    # date.fromordinal(1) is a Monday, so a weekday's ordinals are weekday + 1 mod 7
+    offset = weekday + 1
+    return max(0, (end.toordinal() - offset + 6) // 7 - (start.toordinal() - offset + 6) // 7)
+
+
+def birthday_in_year(birthday: datetime.date, year: int) -> datetime.date:
+    """Get the birthday in a given year, on March 1 for Feb 29 in common years.
+
+    This is the leap-day policy used throughout the integration. It matches
+    calculate_age, which only counts the new year of age once Feb 28 has
+    passed.
+    """
+    try:
+        return birthday.replace(year=year)
+    except ValueError:
+        return datetime.date(year, 3, 1)
+
+
+def _compile_format(currency_info: Dict[str, str]) -> str:
+    """Build the format string for a currency."""
     if currency_info["position"] == "prefix":
-        return f"{symbol}{amount:.2f}"
-    else:
-        return f"{amount:.2f} {symbol}"
+        return currency_info["symbol"] + "{:.2f}"
+    return "{:.2f} " + currency_info["symbol"]
+
+
+_CURRENCY_FORMATS = {
+    currency: _compile_format(currency_info)
+    for currency, currency_info in SUPPORTED_CURRENCIES.items()
+}
+
+
+# Allowances only take a handful of distinct values (age x percentage), so
+# nearly every call is answered from the cache with the same string object.
+@functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def format_allowance(amount: float, currency: str = "EUR") -> str:
+    """Format allowance with currency symbol."""
+    return _CURRENCY_FORMATS.get(currency, _CURRENCY_FORMATS["EUR"]).format(amount)
 
 
 def is_birthday(birthday: datetime.date, check_date: datetime.date = None) -> bool:
-    """Check if today is the birthday."""
+    """Check if today is the birthday, on March 1 for Feb 29 in common years."""
     if check_date is None:
         check_date = datetime.datetime.now().date()
     
-    return birthday.month == check_date.month and birthday.day == check_date.day
+    return birthday_in_year(birthday, check_date.year) == check_date
+
+
+def next_birthday(birthday: datetime.date, check_date: datetime.date = None) -> datetime.date:
+    """Get the date of the next birthday on or after the check date."""
+    if check_date is None:
+        check_date = datetime.datetime.now().date()
+    
+    upcoming = birthday_in_year(birthday, check_date.year)
+    if upcoming < check_date:
+        upcoming = birthday_in_year(birthday, check_date.year + 1)
+    return upcoming
+
+
+class BirthdayCalendar:
+    """Every child's birthday in a year and the year after, as date ordinals.
+
+    Built once a year, so a child's next birthday is a lookup and a
+    comparison instead of placing the birthday in the year again on every
+    update. Feb 29 birthdays are placed with birthday_in_year.
+    """
+
+    def __init__(self, profiles: Iterable["ChildProfile"], year: int):
+        """Initialize the calendar for the given year."""
+        self.year = year
+        self._ordinals: Dict[str, Tuple[int, int]] = {}
+        self.add(profiles)
+
+    def add(self, profiles: Iterable["ChildProfile"]) -> None:
+        """Add or replace the birthdays of the given children."""
+        for profile in profiles:
+            self._ordinals[profile.slug] = (
+                birthday_in_year(profile.birthday, self.year).toordinal(),
+                birthday_in_year(profile.birthday, self.year + 1).toordinal(),
+            )
+
+    def next_birthday_ordinal(self, profile: "ChildProfile", current_date: datetime.date) -> int:
+        """Get the ordinal of a child's next birthday on or after a date in the calendar's year."""
+        this_year, next_year = self._ordinals[profile.slug]
+        return this_year if this_year >= current_date.toordinal() else next_year
+
+    def next_birthday(self, profile: "ChildProfile", current_date: datetime.date) -> datetime.date:
+        """Get a child's next birthday on or after a date in the calendar's year."""
+        return datetime.date.fromordinal(self.next_birthday_ordinal(profile, current_date))
+
+
+class AllowanceBatch(NamedTuple):
+    """Allowance data for many children, one entry per child (and date)."""
+
+    ages: Any
+    allowances: Any
+    next_allowances: Any
+    is_birthday: Any
+    days_until_birthday: Any
+
+
+def calculate_allowance_batch(
+    profiles: Sequence["ChildProfile"],
+    reference_dates: Union[datetime.date, Sequence[datetime.date]] = None,
+) -> AllowanceBatch:
+    """Calculate allowance data for a whole roster in one call.
+
+    With a single reference date every field has one value per child. With a
+    sequence of dates every field has one row per date and one column per
+    child. Results match calculate_age, each profile's schedule, is_birthday
+    and next_birthday exactly. NumPy arrays are returned when NumPy is
+    available, plain lists otherwise.
+    """
+    if reference_dates is None:
+        reference_dates = datetime.datetime.now().date()
+    
+    single = isinstance(reference_dates, datetime.date)
+    dates = [reference_dates] if single else reference_dates
+    
+    if _numpy() is None:
+        batch = _calculate_allowance_batch_python(profiles, dates)
+    else:
+        batch = _calculate_allowance_batch_numpy(profiles, dates)
+    
+    if single:
+        return AllowanceBatch(*(field[0] for field in batch))
+    return batch
+
+
+def _calculate_allowance_batch_python(
+    profiles: Sequence["ChildProfile"],
+    dates: List[datetime.date],
+) -> AllowanceBatch:
+    """Calculate a batch with the scalar functions."""
+    birthdays = [profile.birthday for profile in profiles]
+    batch = AllowanceBatch([], [], [], [], [])
+    for date in dates:
+        ages = [calculate_age(birthday, date) for birthday in birthdays]
+        batch.ages.append(ages)
+        batch.allowances.append(
+            [profile.schedule.allowance(age) for profile, age in zip(profiles, ages)]
+        )
+        batch.next_allowances.append(
+            [profile.schedule.allowance(age + 1) for profile, age in zip(profiles, ages)]
+        )
+        batch.is_birthday.append([is_birthday(birthday, date) for birthday in birthdays])
+        batch.days_until_birthday.append(
+            [(next_birthday(birthday, date) - date).days for birthday in birthdays]
+        )
+    return batch
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """Import NumPy on first use, returning None when it is not installed.
+
+    NumPy takes longer to import than the rest of the integration, and only
+    the batch calculation uses it.
+    """
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - numpy is optional
+        return None
+    return numpy
+
+
+_UNIX_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def _as_datetime64(dates):
+    """Convert a sequence of dates to a datetime64[D] array."""
+    np = _numpy()
+    if isinstance(dates, np.ndarray):
+        return dates.astype("datetime64[D]")
+    # Going through ordinals is much faster than letting NumPy convert
+    # date objects one by one.
+    ordinals = np.fromiter((date.toordinal() for date in dates), dtype=np.int64)
+    return (ordinals - _UNIX_EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+def _split_dates(dates):
+    """Split a datetime64[D] array into year, month and day arrays."""
+    np = _numpy()
+    months = dates.astype("datetime64[M]")
+    year = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+    month = months.astype(np.int64) % 12 + 1
+    day = (dates - months).astype(np.int64) + 1
+    return year, month, day
+
+
+def _birthdays_in_year(years, month, day):
+    """Place birthdays in the given years, on March 1 for Feb 29 in common years."""
+    np = _numpy()
+    months = years.astype("datetime64[M]") + (month - 1)
+    dates = months.astype("datetime64[D]") + (day - 1)
+    # Only Feb 29 can run into the next month, like birthday_in_year
+    overflow = dates.astype("datetime64[M]") != months
+    if overflow.any():
+        dates = np.where(overflow, (months + 1).astype("datetime64[D]"), dates)
+    return dates
+
+
+def _calculate_allowance_batch_numpy(
+    profiles: Sequence["ChildProfile"],
+    dates: List[datetime.date],
+) -> AllowanceBatch:
+    """Calculate a batch with vectorized NumPy operations."""
+    np = _numpy()
+    birthdays = _as_datetime64([profile.birthday for profile in profiles])
+    dates = _as_datetime64(dates)[:, np.newaxis]
+    
+    if (birthdays > dates).any():
+        raise ValueError("Birthday cannot be in the future")
+    
+    b_year, b_month, b_day = _split_dates(birthdays)
+    d_year, d_month, d_day = _split_dates(dates)
+    b_key = b_month * 32 + b_day
+    d_key = d_month * 32 + d_day
+    
+    ages = np.maximum(d_year - b_year - (d_key < b_key), 0)
+    
+    # Allowances come from each child's compiled schedule, which children
+    # with the same parameters share, so the amounts match the scalar path
+    schedules: Dict[int, int] = {}
+    rows = []
+    schedule_index = np.empty(len(profiles), dtype=np.int64)
+    for position, profile in enumerate(profiles):
+        row = schedules.get(id(profile.schedule))
+        if row is None:
+            row = schedules[id(profile.schedule)] = len(rows)
+            rows.append(profile.schedule)
+        schedule_index[position] = row
+    max_age = int(ages.max(initial=0)) + 1
+    table = np.array(
+        [[schedule.allowance(age) for age in range(max_age + 1)] for schedule in rows],
+        dtype=np.float64,
+    ).reshape(len(rows), max_age + 1)
+    
+    this_year = dates.astype("datetime64[Y]")
+    upcoming = _birthdays_in_year(np.broadcast_to(this_year, ages.shape), b_month, b_day)
+    passed = upcoming < dates
+    if passed.any():
+        upcoming = upcoming.copy()
+        upcoming[passed] = _birthdays_in_year(
+            np.broadcast_to(this_year + 1, ages.shape)[passed],
+            np.broadcast_to(b_month, ages.shape)[passed],
+            np.broadcast_to(b_day, ages.shape)[passed],
+        )
+    
+    return AllowanceBatch(
+        ages=ages,
+        allowances=table[schedule_index, ages],
+        next_allowances=table[schedule_index, ages + 1],
+        is_birthday=upcoming == dates,
+        days_until_birthday=(upcoming - dates).astype(np.int64),
+    )
 
 
 def validate_birthday(birthday_str: str) -> bool:
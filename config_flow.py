@@ -1,23 +1,36 @@
 """Config flow for Allowance Calculator integration."""
 import voluptuous as vol
 import datetime
-from typing import Any, Dict, Optional
+import os
+from typing import Any, Dict, List, Optional, Tuple
 
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import CONF_NAME, CONF_CURRENCY
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
 
 from .const import (
     DOMAIN,
     CONF_CHILDREN,
     CONF_BIRTHDAY,
     CONF_PERCENTAGE,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_EXCLUDE_VOLATILE_ATTRIBUTES,
+    CONF_SLICE_BUDGET_MS,
+    CONF_OFFLOAD_TO_EXECUTOR,
     DEFAULT_PERCENTAGE,
     DEFAULT_CURRENCY,
+    DEFAULT_SLICE_BUDGET_MS,
     SUPPORTED_CURRENCIES,
 )
+from .calculator import validate_percentage
+from .models import child_slug
+from .roster import parse_roster
+
+CONF_ROSTER = "roster"
+CONF_FILE_PATH = "file_path"
 
 
 class AllowanceCalculatorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -38,7 +51,7 @@ class AllowanceCalculatorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         
         if user_input is not None:
             self._data[CONF_CURRENCY] = user_input[CONF_CURRENCY]
-            return await self.async_step_add_child()
+            return await self.async_step_add_children()
         
         # Show currency selection form
         return self.async_show_form(
@@ -50,30 +63,28 @@ class AllowanceCalculatorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_add_children(self, user_input: Optional[Dict[str, Any]] = None) -> FlowResult:
+        """Ask whether to add children one by one or import a roster."""
+        return self.async_show_menu(
+            step_id="add_children",
+            menu_options=["add_child", "bulk_import"],
+        )
+
     async def async_step_add_child(self, user_input: Optional[Dict[str, Any]] = None) -> FlowResult:
         """Handle adding a child."""
         errors = {}
         
         if user_input is not None:
-            try:
-                # Validate birthday format
-                birthday = datetime.datetime.strptime(user_input[CONF_BIRTHDAY], "%Y-%m-%d").date()
+            errors = _child_errors(user_input, self._data[CONF_CHILDREN])
+            if not errors:
+                self._data[CONF_CHILDREN].append({
+                    CONF_NAME: user_input[CONF_NAME],
+                    CONF_BIRTHDAY: user_input[CONF_BIRTHDAY],
+                    CONF_PERCENTAGE: user_input.get(CONF_PERCENTAGE, DEFAULT_PERCENTAGE),
+                })
                 
-                # Validate that birthday is in the past
-                if birthday > datetime.datetime.now().date():
-                    errors[CONF_BIRTHDAY] = "birthday_in_future"
-                
-                if not errors:
-                    self._data[CONF_CHILDREN].append({
-                        CONF_NAME: user_input[CONF_NAME],
-                        CONF_BIRTHDAY: user_input[CONF_BIRTHDAY],
-                        CONF_PERCENTAGE: user_input.get(CONF_PERCENTAGE, DEFAULT_PERCENTAGE),
-                    })
-                    
-                    # Ask if the user wants to add another child
-                    return await self.async_step_add_another()
-            except ValueError:
-                errors[CONF_BIRTHDAY] = "invalid_date"
+                # Ask if the user wants to add another child
+                return await self.async_step_add_another()
         
         # Show child form
         return self.async_show_form(
@@ -95,11 +106,7 @@ class AllowanceCalculatorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if user_input.get("add_another", False):
                 return await self.async_step_add_child()
             else:
-                # Create the config entry
-                return self.async_create_entry(
-                    title=f"Allowance Calculator ({len(self._data[CONF_CHILDREN])} children)",
-                    data=self._data,
-                )
+                return self._async_create_roster_entry()
         
         return self.async_show_form(
             step_id="add_another",
@@ -112,6 +119,59 @@ class AllowanceCalculatorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             },
         )
 
+    async def async_step_bulk_import(self, user_input: Optional[Dict[str, Any]] = None) -> FlowResult:
+        """Import a whole roster from pasted CSV or JSON, or from a file."""
+        errors = {}
+        problems: List[str] = []
+        
+        if user_input is not None:
+            roster = user_input.get(CONF_ROSTER, "").strip()
+            file_path = user_input.get(CONF_FILE_PATH, "").strip()
+            
+            if bool(roster) == bool(file_path):
+                errors["base"] = "roster_or_file"
+            elif file_path and not self.hass.config.is_allowed_path(file_path):
+                errors[CONF_FILE_PATH] = "file_not_allowed"
+            elif file_path:
+                try:
+                    children, problems = await self.hass.async_add_executor_job(
+                        _parse_roster_file, file_path
+                    )
+                except OSError:
+                    errors[CONF_FILE_PATH] = "file_not_found"
+            else:
+                # Large pasted rosters are parsed off the event loop too
+                children, problems = await self.hass.async_add_executor_job(
+                    parse_roster, roster.splitlines(keepends=True)
+                )
+            
+            if problems:
+                errors["base"] = "invalid_roster"
+            elif not errors:
+                self._data[CONF_CHILDREN].extend(children)
+                return self._async_create_roster_entry()
+        
+        return self.async_show_form(
+            step_id="bulk_import",
+            data_schema=vol.Schema({
+                vol.Optional(CONF_ROSTER, description={"suggested_value": (user_input or {}).get(CONF_ROSTER)}):
+                    TextSelector(TextSelectorConfig(multiline=True)),
+                vol.Optional(CONF_FILE_PATH, description={"suggested_value": (user_input or {}).get(CONF_FILE_PATH)}): str,
+            }),
+            errors=errors,
+            description_placeholders={
+                "problems": "\n".join(problems),
+            },
+        )
+
+    @callback
+    def _async_create_roster_entry(self) -> FlowResult:
+        """Create the config entry for the children added so far."""
+        return self.async_create_entry(
+            title=f"Allowance Calculator ({len(self._data[CONF_CHILDREN])} children)",
+            data=self._data,
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -119,6 +179,18 @@ class AllowanceCalculatorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return AllowanceCalculatorOptionsFlow(config_entry)
 
 
+def _parse_roster_file(file_path: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Parse a roster file line by line, reporting a file that is not UTF-8 as a problem."""
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(file_path)
+    # utf-8-sig also reads the byte order mark that Excel puts in CSV files
+    with open(file_path, encoding="utf-8-sig", newline="") as roster_file:
+        try:
+            return parse_roster(roster_file)
+        except UnicodeDecodeError as e:
+            return [], [f"The file is not UTF-8 text ({e.reason})"]
+
+
 class AllowanceCalculatorOptionsFlow(config_entries.OptionsFlow):
     """Handle options for the Allowance Calculator."""
 
@@ -126,18 +198,151 @@ class AllowanceCalculatorOptionsFlow(config_entries.OptionsFlow):
         """Initialize options flow."""
         self.config_entry = config_entry
         self.options = dict(config_entry.options)
+        self._children = list(
+            self.options.get(CONF_CHILDREN, config_entry.data.get(CONF_CHILDREN, []))
+        )
+        self._edited_child: Optional[str] = None
 
     async def async_step_init(self, user_input=None):
-        """Manage the options."""
+        """Choose what to change."""
+        return self.async_show_menu(
+            step_id="init",
+            menu_options=["settings", "add_child", "edit_child", "remove_children"],
+        )
+
+    async def async_step_settings(self, user_input=None):
+        """Manage the currency, recorder and update options."""
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            return self._async_save(user_input)
 
-        current_currency = self.config_entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY)
+        current_currency = self.options.get(
+            CONF_CURRENCY, self.config_entry.data.get(CONF_CURRENCY, DEFAULT_CURRENCY)
+        )
 
         return self.async_show_form(
-            step_id="init",
+            step_id="settings",
             data_schema=vol.Schema({
                 vol.Required(CONF_CURRENCY, default=current_currency): 
                     vol.In(list(SUPPORTED_CURRENCIES.keys())),
+                vol.Required(
+                    CONF_LONG_TERM_STATISTICS,
+                    default=self.options.get(CONF_LONG_TERM_STATISTICS, False),
+                ): bool,
+                vol.Required(
+                    CONF_EXCLUDE_VOLATILE_ATTRIBUTES,
+                    default=self.options.get(CONF_EXCLUDE_VOLATILE_ATTRIBUTES, False),
+                ): bool,
+                vol.Required(
+                    CONF_SLICE_BUDGET_MS,
+                    default=self.options.get(CONF_SLICE_BUDGET_MS, DEFAULT_SLICE_BUDGET_MS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+                vol.Required(
+                    CONF_OFFLOAD_TO_EXECUTOR,
+                    default=self.options.get(CONF_OFFLOAD_TO_EXECUTOR, False),
+                ): bool,
             }),
         )
+
+    async def async_step_add_child(self, user_input=None):
+        """Add a child."""
+        errors = {}
+        
+        if user_input is not None:
+            errors = _child_errors(user_input, self._children)
+            if not errors:
+                self._children.append({
+                    CONF_NAME: user_input[CONF_NAME],
+                    CONF_BIRTHDAY: user_input[CONF_BIRTHDAY],
+                    CONF_PERCENTAGE: user_input.get(CONF_PERCENTAGE, DEFAULT_PERCENTAGE),
+                })
+                return self._async_save({CONF_CHILDREN: self._children})
+        
+        return self.async_show_form(
+            step_id="add_child",
+            data_schema=vol.Schema({
+                vol.Required(CONF_NAME): str,
+                vol.Required(CONF_BIRTHDAY): str,
+                vol.Optional(CONF_PERCENTAGE, default=DEFAULT_PERCENTAGE): vol.Coerce(float),
+            }),
+            errors=errors,
+            description_placeholders={
+                "birthday_format": "YYYY-MM-DD",
+            },
+        )
+
+    async def async_step_edit_child(self, user_input=None):
+        """Choose the child whose percentage to change."""
+        if user_input is not None:
+            self._edited_child = user_input[CONF_NAME]
+            return await self.async_step_edit_percentage()
+        
+        return self.async_show_form(
+            step_id="edit_child",
+            data_schema=vol.Schema({
+                vol.Required(CONF_NAME): vol.In([child[CONF_NAME] for child in self._children]),
+            }),
+        )
+
+    async def async_step_edit_percentage(self, user_input=None):
+        """Change the chosen child's percentage."""
+        errors = {}
+        
+        if user_input is not None:
+            if not validate_percentage(user_input[CONF_PERCENTAGE]):
+                errors[CONF_PERCENTAGE] = "invalid_percentage"
+            else:
+                self._children = [
+                    {**child, CONF_PERCENTAGE: user_input[CONF_PERCENTAGE]}
+                    if child[CONF_NAME] == self._edited_child else child
+                    for child in self._children
+                ]
+                return self._async_save({CONF_CHILDREN: self._children})
+        
+        child = next(child for child in self._children if child[CONF_NAME] == self._edited_child)
+        return self.async_show_form(
+            step_id="edit_percentage",
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_PERCENTAGE, default=child.get(CONF_PERCENTAGE, DEFAULT_PERCENTAGE)
+                ): vol.Coerce(float),
+            }),
+            errors=errors,
+            description_placeholders={"name": self._edited_child},
+        )
+
+    async def async_step_remove_children(self, user_input=None):
+        """Remove one or more children."""
+        if user_input is not None:
+            removed = set(user_input[CONF_CHILDREN])
+            self._children = [child for child in self._children if child[CONF_NAME] not in removed]
+            return self._async_save({CONF_CHILDREN: self._children})
+        
+        names = [child[CONF_NAME] for child in self._children]
+        return self.async_show_form(
+            step_id="remove_children",
+            data_schema=vol.Schema({
+                vol.Required(CONF_CHILDREN, default=[]): cv.multi_select(names),
+            }),
+        )
+
+    @callback
+    def _async_save(self, changes: Dict[str, Any]) -> FlowResult:
+        """Save the changed options, which the entry's update listener applies in place."""
+        return self.async_create_entry(title="", data={**self.options, **changes})
+
+
+def _child_errors(user_input: Dict[str, Any], children: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Validate a child added through a form."""
+    try:
+        birthday = datetime.datetime.strptime(user_input[CONF_BIRTHDAY], "%Y-%m-%d").date()
+    except ValueError:
+        return {CONF_BIRTHDAY: "invalid_date"}
+    
+    if birthday > datetime.datetime.now().date():
+        return {CONF_BIRTHDAY: "birthday_in_future"}
+    
+    slug = child_slug(user_input[CONF_NAME])
+    if any(child_slug(child[CONF_NAME]) == slug for child in children):
+        return {CONF_NAME: "name_exists"}
+    
+    return {}
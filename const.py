@@ -8,6 +8,15 @@ CONF_CHILDREN = "children"
 CONF_BIRTHDAY = "birthday"
 CONF_PERCENTAGE = "percentage"
 CONF_CURRENCY = "currency"
+CONF_MIN_AGE = "min_age"
+CONF_BRACKETS = "brackets"
+CONF_STEP = "step"
+CONF_CAP = "cap"
+CONF_OVERRIDES = "overrides"
+CONF_LONG_TERM_STATISTICS = "long_term_statistics"
+CONF_EXCLUDE_VOLATILE_ATTRIBUTES = "exclude_volatile_attributes"
+CONF_SLICE_BUDGET_MS = "slice_budget_ms"
+CONF_OFFLOAD_TO_EXECUTOR = "offload_to_executor"
 
 # Defaults
 DEFAULT_PERCENTAGE = 30
@@ -15,6 +24,12 @@ DEFAULT_CURRENCY = "EUR"
 MIN_AGE_FOR_ALLOWANCE = 6
 MAX_PERCENTAGE = 100
 MIN_PERCENTAGE = 0
+MAX_SCHEDULE_AGE = 25
+ENTITY_CHUNK_SIZE = 500
+SIMULATION_CHUNK_SIZE = 500
+DEFAULT_SLICE_BUDGET_MS = 10
+PAYDAY_WEEKDAY = 4  # Friday
+PROJECTION_AGE = 18
 
 # Currency Settings
 SUPPORTED_CURRENCIES = {
@@ -29,10 +44,36 @@ SUPPORTED_CURRENCIES = {
     "NOK": {"symbol": "kr", "position": "suffix"},
     "DKK": {"symbol": "kr", "position": "suffix"},
 }
+FORMAT_CACHE_SIZE = 1024
+# Children sharing a birthday and a schedule share their earnings by age
+EARNINGS_CACHE_SIZE = 8192
 
 # Icons
 ICON = "mdi:cash"
 ICON_BIRTHDAY = "mdi:cake-variant"
+ICON_DIAGNOSTICS = "mdi:timer-outline"
+ICON_ROSTER = "mdi:account-group"
 
 # Notification constants
-NOTIFICATION_ID_PREFIX = "allowance_calculator_birthday"
\ No newline at end of file
+NOTIFICATION_ID_PREFIX = "allowance_calculator_birthday"
+
+# Dispatcher signals, formatted with the config entry ID
+SIGNAL_CHILDREN_ADDED = f"{DOMAIN}_children_added_{{}}"
+
+# Storage
+STORAGE_VERSION = 1
+STORAGE_KEY_ANNOUNCED = f"{DOMAIN}.announced"
+STORAGE_KEY_LEDGER = f"{DOMAIN}.ledger"
+
+# Attributes that change daily or weekly, which can be kept out of the recorder
+VOLATILE_ATTRIBUTES = frozenset({
+    "days_until_birthday",
+    "total_earned",
+    "earned_this_year",
+    "projected_until_18",
+    "paid_total",
+})
+
+# Payout ledger
+LEDGER_MAX_ENTRIES = 500
+LEDGER_KEEP_ENTRIES = 100
@@ -0,0 +1,352 @@
+"""Data update coordinator for the Allowance Calculator integration."""
+import asyncio
+import datetime
+import functools
+import heapq
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, PROJECTION_AGE
+from .calculator import BirthdayCalendar, count_paydays, get_child_allowance_data
+from .ledger import PayoutLedger
+from .models import ChildProfile
+from .scheduler import CooperativeScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class UpdateStats:
+    """Timings and counters for the coordinator's update cycles."""
+
+    cycles: int = 0
+    last_update: Optional[datetime.datetime] = None
+    last_duration_ms: float = 0.0
+    max_duration_ms: float = 0.0
+    total_duration_ms: float = 0.0
+    executor_time_ms: float = 0.0
+    slices: int = 0
+    max_slice_ms: float = 0.0
+    children_processed: int = 0
+    children_recomputed: int = 0
+    state_writes: int = 0
+    state_writes_skipped: int = 0
+    total_state_writes: int = 0
+    total_state_writes_skipped: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the stats as a JSON serializable dict."""
+        data = asdict(self)
+        if self.last_update is not None:
+            data["last_update"] = self.last_update.isoformat()
+        return data
+
+
+def _earnings_after(child_data: Dict[str, Any], paydays: int) -> Dict[str, float]:
+    """Move the earnings of a number of paydays from projected to earned."""
+    earned = paydays * child_data["allowance"]
+    earnings = {
+        "total_earned": round(child_data["total_earned"] + earned, 2),
+        "earned_this_year": round(child_data["earned_this_year"] + earned, 2),
+    }
+    if child_data["age"] < PROJECTION_AGE:
+        earnings["projected_until_18"] = round(child_data["projected_until_18"] - earned, 2)
+    return earnings
+
+
+def _next_change(child_data: Dict[str, Any], current_date: datetime.date) -> datetime.date:
+    """Return the date a child's data needs to be recomputed: their birthday, or the day after it."""
+    next_change = child_data["next_birthday"]
+    if next_change <= current_date:
+        next_change = current_date + datetime.timedelta(days=1)
+    return next_change
+
+
+def _child_data(
+    profile: ChildProfile, current_date: datetime.date, calendar: BirthdayCalendar
+) -> Optional[Dict[str, Any]]:
+    """Compute a child's data, logging and returning None if that fails."""
+    try:
+        return get_child_allowance_data(profile, current_date, calendar)
+    except ValueError as e:
+        _LOGGER.error(f"Error updating allowance data for {profile.name}: {e}")
+        return None
+
+
+class AllowanceCoordinator(DataUpdateCoordinator[Dict[str, Dict[str, Any]]]):
+    """Recompute every child once a day and fan the results out to entities."""
+
+    def __init__(self, hass: HomeAssistant, profiles: List[ChildProfile], currency: str):
+        """Initialize the coordinator."""
+        super().__init__(hass, _LOGGER, name=DOMAIN)
+        self.profiles = profiles
+        self.currency = currency
+        self.ledger: Optional[PayoutLedger] = None
+        # Options the entry was set up with that need a reload to change
+        self.recorder_options: Tuple[bool, bool] = (False, False)
+        self._unsub_midnight: Optional[Callable[[], None]] = None
+        self._last_date: Optional[datetime.date] = None
+        # Min-heap of (date of next change, index into profiles)
+        self._next_changes: List[Tuple[datetime.date, int]] = []
+        # Rebuilt when the year changes
+        self._calendar: Optional[BirthdayCalendar] = None
+        self.stats = UpdateStats()
+        self._stats_listeners: List[Callable[[], None]] = []
+        self._cycle_start: Optional[float] = None
+        self.scheduler = CooperativeScheduler(hass)
+        self._midnight_task: Optional[asyncio.Task] = None
+        # Bumped whenever the roster changes, so a running update can start over
+        self._generation = 0
+
+    @property
+    def current_date(self) -> Optional[datetime.date]:
+        """Return the date the current data was computed for."""
+        return self._last_date
+
+    async def _async_update_data(self) -> Dict[str, Dict[str, Any]]:
+        """Compute the data for every child for today."""
+        return await self._async_compute(dt_util.now().date())
+
+    async def _async_compute(self, current_date: datetime.date) -> Dict[str, Dict[str, Any]]:
+        """Compute allowance data for every child for the given date.
+
+        Only the children whose next change (their birthday, or the day after
+        it) is due are recomputed; everyone else just gets their days until
+        birthday moved. The work is done in slices, or in the executor, so the
+        loop is never blocked for longer than the scheduler's budget.
+        """
+        start = time.perf_counter()
+        self.scheduler.reset_stats()
+        while True:
+            generation = self._generation
+            profiles = self.profiles
+            previous = self.data
+            next_changes = list(self._next_changes)
+            tomorrow = current_date + datetime.timedelta(days=1)
+            data: Dict[str, Dict[str, Any]] = {}
+            if (
+                previous is None
+                or self._last_date is None
+                or current_date < self._last_date
+                # Earnings this year start over on January 1
+                or current_date.year != self._last_date.year
+            ):
+                next_changes = []
+                due = list(range(len(profiles)))
+                calendar = BirthdayCalendar(profiles, current_date.year)
+            else:
+                calendar = self._calendar
+                # Without a birthday in between, every payday since the last
+                # update was paid at the current allowance
+                paydays = count_paydays(self._last_date + datetime.timedelta(days=1), tomorrow)
+                
+                def move(item: Tuple[str, Dict[str, Any]]) -> None:
+                    """Move a child's countdown and earnings to the new date."""
+                    slug, child_data = item
+                    data[slug] = {
+                        **child_data,
+                        "days_until_birthday": (child_data["next_birthday"] - current_date).days,
+                        **(_earnings_after(child_data, paydays) if paydays else {}),
+                    }
+                
+                await self.scheduler.async_run(previous.items(), move)
+                due = []
+                while next_changes and next_changes[0][0] <= current_date:
+                    due.append(heapq.heappop(next_changes)[1])
+            
+            results = await self.scheduler.async_map(
+                functools.partial(_child_data, current_date=current_date, calendar=calendar),
+                [profiles[index] for index in due],
+            )
+            # Start over if the roster was changed while this was computed
+            if generation == self._generation:
+                break
+        
+        for index, child_data in zip(due, results):
+            if child_data is None:
+                data.pop(profiles[index].slug, None)
+                heapq.heappush(next_changes, (tomorrow, index))
+                continue
+            data[profiles[index].slug] = child_data
+            heapq.heappush(next_changes, (_next_change(child_data, current_date), index))
+        
+        self._next_changes = next_changes
+        self._calendar = calendar
+        self._last_date = current_date
+        self.stats.children_processed = len(data)
+        self.stats.children_recomputed = len(due)
+        self._cycle_start = start
+        return data
+
+    @callback
+    def async_set_profiles(self, profiles: List[ChildProfile], currency: str) -> None:
+        """Swap in a changed roster and currency, recomputing only the children that changed."""
+        start = time.perf_counter()
+        self._generation += 1
+        self.scheduler.reset_stats()
+        current_date = self._last_date or dt_util.now().date()
+        tomorrow = current_date + datetime.timedelta(days=1)
+        previous_profiles = {profile.slug: profile for profile in self.profiles}
+        previous = self.data or {}
+        self.profiles = profiles
+        self.currency = currency
+        
+        if self._calendar is None or self._calendar.year != current_date.year:
+            self._calendar = BirthdayCalendar(profiles, current_date.year)
+        
+        data = {}
+        recomputed = 0
+        # Indexes into profiles shift, so the schedule is rebuilt
+        self._next_changes = []
+        for index, profile in enumerate(profiles):
+            child_data = previous.get(profile.slug)
+            if child_data is None or previous_profiles.get(profile.slug) != profile:
+                recomputed += 1
+                self._calendar.add((profile,))
+                try:
+                    child_data = get_child_allowance_data(profile, current_date, self._calendar)
+                except ValueError as e:
+                    self._next_changes.append((tomorrow, index))
+                    _LOGGER.error(f"Error updating allowance data for {profile.name}: {e}")
+                    continue
+            
+            data[profile.slug] = child_data
+            self._next_changes.append((_next_change(child_data, current_date), index))
+        heapq.heapify(self._next_changes)
+        
+        self._last_date = current_date
+        self.stats.children_processed = len(data)
+        self.stats.children_recomputed = recomputed
+        self._cycle_start = start
+        self.async_set_updated_data(data)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify all listeners at once and record how long the cycle took."""
+        start = self._start_cycle()
+        super().async_update_listeners()
+        self._finish_cycle(start)
+
+    async def _async_update_listeners_in_slices(self) -> None:
+        """Notify all listeners in slices and record how long the cycle took."""
+        start = self._start_cycle()
+        await self.scheduler.async_run(
+            list(self._listeners.values()), lambda listener: listener[0]()
+        )
+        self._finish_cycle(start)
+
+    def _start_cycle(self) -> float:
+        """Reset the counters of a single cycle and return when it started."""
+        # The cycle started with the computation, if this notifies its result
+        start, self._cycle_start = self._cycle_start, None
+        if start is None:
+            start = time.perf_counter()
+            self.scheduler.reset_stats()
+        self.stats.state_writes = 0
+        self.stats.state_writes_skipped = 0
+        return start
+
+    def _finish_cycle(self, start: float) -> None:
+        """Record the stats of a finished cycle and notify the stats listeners."""
+        duration_ms = (time.perf_counter() - start) * 1000
+        
+        stats = self.stats
+        stats.cycles += 1
+        stats.last_update = dt_util.utcnow()
+        stats.last_duration_ms = round(duration_ms, 3)
+        stats.max_duration_ms = max(stats.max_duration_ms, stats.last_duration_ms)
+        stats.total_duration_ms = round(stats.total_duration_ms + duration_ms, 3)
+        stats.slices = self.scheduler.slices
+        stats.max_slice_ms = round(self.scheduler.max_slice_ms, 3)
+        stats.executor_time_ms = round(self.scheduler.executor_time_ms, 3)
+        stats.total_state_writes += stats.state_writes
+        stats.total_state_writes_skipped += stats.state_writes_skipped
+        
+        for update_callback in list(self._stats_listeners):
+            update_callback()
+
+    @callback
+    def async_add_stats_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Listen for the stats of each finished update cycle."""
+        self._stats_listeners.append(update_callback)
+        
+        @callback
+        def remove_listener() -> None:
+            """Remove the stats listener."""
+            self._stats_listeners.remove(update_callback)
+        
+        return remove_listener
+
+    @callback
+    def async_record_state_write(self, written: bool) -> None:
+        """Record whether a listener wrote its state or skipped it."""
+        if written:
+            self.stats.state_writes += 1
+        else:
+            self.stats.state_writes_skipped += 1
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Start the shared midnight timer and return a callback to stop it."""
+        if self._unsub_midnight is None:
+            self._async_schedule_midnight()
+        return self.async_stop
+
+    @callback
+    def _async_schedule_midnight(self) -> None:
+        """Arm the timer for the start of the next local day.
+
+        Where DST starts at midnight that day has no 00:00, and the timer fires
+        at the first time it does have instead of skipping the whole day.
+        """
+        tomorrow = dt_util.now().date() + datetime.timedelta(days=1)
+        self._unsub_midnight = async_track_point_in_utc_time(
+            self.hass, self._handle_midnight, dt_util.as_utc(dt_util.start_of_local_day(tomorrow))
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the shared midnight timer and any update it started."""
+        if self._unsub_midnight is not None:
+            self._unsub_midnight()
+            self._unsub_midnight = None
+        if self._midnight_task is not None:
+            self._midnight_task.cancel()
+            self._midnight_task = None
+
+    async def async_shutdown(self) -> None:
+        """Cancel the midnight timer along with any other scheduled call."""
+        self.async_stop()
+        await super().async_shutdown()
+
+    @callback
+    def _handle_midnight(self, now: datetime.datetime) -> None:
+        """Start the day's update and arm the timer for the next one."""
+        self._async_schedule_midnight()
+        self._midnight_task = self.hass.async_create_task(
+            self._async_midnight_update(dt_util.as_local(now).date())
+        )
+
+    async def _async_midnight_update(self, current_date: datetime.date) -> None:
+        """Recompute the children that changed and notify all entities, in slices."""
+        try:
+            try:
+                self.data = await self._async_compute(current_date)
+            except Exception as e:  # pylint: disable=broad-except
+                # Like a failed refresh: keep the old data, mark the entities unavailable
+                self.last_exception = e
+                if self.last_update_success:
+                    _LOGGER.exception(f"Error updating allowance data for {current_date}: {e}")
+                self.last_update_success = False
+            else:
+                self.last_update_success = True
+            await self._async_update_listeners_in_slices()
+        finally:
+            self._midnight_task = None
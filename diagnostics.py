@@ -0,0 +1,31 @@
+"""Diagnostics support for the Allowance Calculator integration."""
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_BIRTHDAY
+
+TO_REDACT = {CONF_NAME, CONF_BIRTHDAY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    current_date = coordinator.current_date
+    
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "children": len(coordinator.profiles),
+        "currency": coordinator.currency,
+        "current_date": current_date.isoformat() if current_date else None,
+        "last_update_success": coordinator.last_update_success,
+        "stats": coordinator.stats.as_dict(),
+    }
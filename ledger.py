@@ -0,0 +1,130 @@
+"""Payout ledger for the Allowance Calculator integration."""
+import logging
+from typing import Any, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    LEDGER_KEEP_ENTRIES,
+    LEDGER_MAX_ENTRIES,
+    STORAGE_KEY_LEDGER,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+SAVE_DELAY = 10
+
+KIND_PAYOUT = "payout"
+KIND_ADJUSTMENT = "adjustment"
+
+
+class PayoutLedger:
+    """An append-only log of payouts, compacted into running balances.
+
+    Once the log grows past LEDGER_MAX_ENTRIES, all but the most recent
+    LEDGER_KEEP_ENTRIES are folded into per-child balances. The stored data
+    therefore stays bounded, and balances are kept up to date on every
+    append instead of being replayed from the log.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Initialize the ledger."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY_LEDGER}.{entry_id}")
+        # Balances of the entries that were compacted away
+        self._compacted: Dict[str, float] = {}
+        self._compacted_count = 0
+        self._entries: List[Dict[str, Any]] = []
+        self._balances: Dict[str, float] = {}
+        self._dirty = False
+
+    async def async_load(self) -> None:
+        """Load the ledger from storage."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        
+        self._compacted = stored["compacted"]
+        self._compacted_count = stored["compacted_count"]
+        self._entries = stored["entries"]
+        self._balances = dict(self._compacted)
+        for entry in self._entries:
+            self._add_to_balance(entry["child"], entry["amount"])
+
+    def balance(self, slug: str) -> float:
+        """Return the total paid out to a child, including adjustments."""
+        return self._balances.get(slug, 0.0)
+
+    def entries(self, slug: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the entries that have not been compacted yet."""
+        if slug is None:
+            return list(self._entries)
+        return [entry for entry in self._entries if entry["child"] == slug]
+
+    @callback
+    def async_mark_paid(self, slug: str, amount: float, note: Optional[str] = None) -> float:
+        """Record a payout to a child and return their new balance."""
+        return self._async_append(KIND_PAYOUT, slug, amount, note)
+
+    @callback
+    def async_adjust(self, slug: str, amount: float, note: Optional[str] = None) -> float:
+        """Record a correction to a child's balance and return the new balance."""
+        return self._async_append(KIND_ADJUSTMENT, slug, amount, note)
+
+    async def async_flush(self) -> None:
+        """Write any pending changes right away."""
+        if self._dirty:
+            self._dirty = False
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove the ledger from storage."""
+        await self._store.async_remove()
+
+    @callback
+    def _async_append(self, kind: str, slug: str, amount: float, note: Optional[str]) -> float:
+        """Append an entry, compact the log if needed and schedule a save."""
+        amount = round(amount, 2)
+        entry = {
+            "time": dt_util.utcnow().isoformat(),
+            "kind": kind,
+            "child": slug,
+            "amount": amount,
+        }
+        if note:
+            entry["note"] = note
+        self._entries.append(entry)
+        self._add_to_balance(slug, amount)
+        
+        if len(self._entries) > LEDGER_MAX_ENTRIES:
+            self._compact()
+        
+        self._dirty = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return self.balance(slug)
+
+    def _add_to_balance(self, slug: str, amount: float) -> None:
+        """Add an amount to a child's running balance."""
+        self._balances[slug] = round(self._balances.get(slug, 0.0) + amount, 2)
+
+    def _compact(self) -> None:
+        """Fold all but the most recent entries into the compacted balances."""
+        split = len(self._entries) - LEDGER_KEEP_ENTRIES
+        for entry in self._entries[:split]:
+            slug = entry["child"]
+            self._compacted[slug] = round(self._compacted.get(slug, 0.0) + entry["amount"], 2)
+        self._compacted_count += split
+        self._entries = self._entries[split:]
+        _LOGGER.debug(f"Compacted {split} ledger entries, {self._compacted_count} in total")
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data to store."""
+        return {
+            "compacted": self._compacted,
+            "compacted_count": self._compacted_count,
+            "entries": self._entries,
+        }
@@ -0,0 +1,166 @@
+"""Long-term statistics for the Allowance Calculator integration."""
+import datetime
+import logging
+from typing import Dict, List, Optional
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+from .calculator import iter_paydays
+from .coordinator import AllowanceCoordinator
+from .models import ChildProfile
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StatisticsPublisher:
+    """Publish cumulative earnings and payouts as long-term statistics.
+
+    Earnings get one row per payday, which is the only day they change, and
+    payouts get one row per day. Rows are imported into the recorder in
+    batches, so a roster's history costs a few rows per week instead of a
+    full state with attributes for every child every day.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: AllowanceCoordinator):
+        """Initialize the publisher."""
+        self.hass = hass
+        self.coordinator = coordinator
+        # Last payday already imported and sum at that point, per child
+        self._earned_until: Dict[str, Optional[datetime.date]] = {}
+        self._earned_sum: Dict[str, float] = {}
+        self._paid: Dict[str, float] = {}
+        self._loaded = False
+        self._publishing = False
+        self._pending = False
+
+    @callback
+    def async_schedule_publish(self) -> None:
+        """Publish the statistics after a coordinator update."""
+        self._pending = True
+        if not self._publishing:
+            self._publishing = True
+            self.hass.async_create_task(self._async_publish())
+
+    async def _async_publish(self) -> None:
+        """Import the rows added since the last publish."""
+        try:
+            if not self._loaded:
+                await self._async_load_last_statistics()
+                self._loaded = True
+            
+            # Updates that arrive while loading are picked up by another pass
+            while self._pending:
+                self._pending = False
+                current_date = self.coordinator.current_date
+                if current_date is None:
+                    return
+                
+                # Backfilling years of paydays is spread over several slices
+                await self.coordinator.scheduler.async_run(
+                    self.coordinator.profiles,
+                    lambda profile: self._async_publish_profile(profile, current_date),
+                )
+        finally:
+            self._publishing = False
+
+    async def _async_load_last_statistics(self) -> None:
+        """Find where each child's earnings statistics left off."""
+        profiles = self.coordinator.profiles
+        # One trip to the recorder's executor for the whole roster
+        last = await get_instance(self.hass).async_add_executor_job(
+            _get_last_rows, self.hass, [_statistic_id(profile, "earned") for profile in profiles]
+        )
+        for profile in profiles:
+            rows = last.get(_statistic_id(profile, "earned"))
+            if rows:
+                self._earned_until[profile.slug] = dt_util.as_local(
+                    dt_util.utc_from_timestamp(rows[0]["start"])
+                ).date()
+                self._earned_sum[profile.slug] = rows[0]["sum"] or 0.0
+
+    @callback
+    def _async_publish_profile(self, profile: ChildProfile, current_date: datetime.date) -> None:
+        """Import a child's new earnings and payout rows."""
+        # A child whose rows are rejected must not hold up the rest of the roster
+        try:
+            self._async_publish_earned(profile, current_date)
+            self._async_publish_paid(profile, current_date)
+        except Exception as e:  # pylint: disable=broad-except
+            _LOGGER.exception(f"Error publishing the statistics of {profile.name}: {e}")
+
+    @callback
+    def _async_publish_earned(self, profile: ChildProfile, current_date: datetime.date) -> None:
+        """Import the paydays up to and including today, backfilling from the birthday."""
+        earned_until = self._earned_until.get(profile.slug)
+        start = profile.birthday if earned_until is None else earned_until + datetime.timedelta(days=1)
+        
+        total = self._earned_sum.get(profile.slug, 0.0)
+        statistics: List[StatisticData] = []
+        for payday, amount in iter_paydays(profile, start, current_date + datetime.timedelta(days=1)):
+            earned_until = payday
+            if not amount:
+                continue
+            total = round(total + amount, 2)
+            statistics.append(
+                StatisticData(start=dt_util.start_of_local_day(payday), state=total, sum=total)
+            )
+        
+        if statistics:
+            async_add_external_statistics(
+                self.hass, _metadata(profile, "earned", self.coordinator.currency), statistics
+            )
+        # Only once they were accepted, so rejected rows are tried again
+        self._earned_until[profile.slug] = earned_until
+        self._earned_sum[profile.slug] = total
+
+    @callback
+    def _async_publish_paid(self, profile: ChildProfile, current_date: datetime.date) -> None:
+        """Import today's paid total if it changed."""
+        ledger = self.coordinator.ledger
+        if ledger is None:
+            return
+        
+        paid = ledger.balance(profile.slug)
+        if self._paid.get(profile.slug) == paid:
+            return
+        
+        async_add_external_statistics(
+            self.hass,
+            _metadata(profile, "paid", self.coordinator.currency),
+            [StatisticData(start=dt_util.start_of_local_day(current_date), state=paid, sum=paid)],
+        )
+        self._paid[profile.slug] = paid
+
+
+def _get_last_rows(hass: HomeAssistant, statistic_ids: List[str]) -> Dict[str, List[Dict]]:
+    """Return the last row of each statistic, in the recorder's executor."""
+    last: Dict[str, List[Dict]] = {}
+    for statistic_id in statistic_ids:
+        last.update(get_last_statistics(hass, 1, statistic_id, False, {"sum"}))
+    return last
+
+
+def _statistic_id(profile: ChildProfile, kind: str) -> str:
+    """Return the id of one of a child's statistics."""
+    # The recorder only accepts lowercase letters, digits and single underscores
+    return f"{DOMAIN}:{slugify(profile.name)}_{kind}"
+
+
+def _metadata(profile: ChildProfile, kind: str, currency: str) -> StatisticMetaData:
+    """Return the metadata of one of a child's statistics."""
+    return StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=f"{profile.name}'s allowance {kind}",
+        source=DOMAIN,
+        statistic_id=_statistic_id(profile, kind),
+        unit_of_measurement=currency,
+    )
@@ -0,0 +1,70 @@
+"""Data models for the Allowance Calculator integration."""
+import datetime
+import functools
+import logging
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List
+
+from homeassistant.const import CONF_NAME
+
+from .const import (
+    CONF_BIRTHDAY,
+    CONF_PERCENTAGE,
+    DEFAULT_PERCENTAGE,
+    MAX_PERCENTAGE,
+    MIN_PERCENTAGE,
+)
+from .rules import AllowanceSchedule, AllowanceTable, compile_schedule
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ChildProfile:
+    """A child's configuration, parsed and normalized once."""
+
+    name: str
+    slug: str
+    birthday: datetime.date
+    birthday_iso: str
+    percentage: float
+    schedule: AllowanceTable
+
+    @classmethod
+    def from_config(cls, child_config: Dict[str, Any]) -> "ChildProfile":
+        """Build a profile from a child's config, raising ValueError if invalid."""
+        name = child_config[CONF_NAME]
+        birthday = datetime.datetime.strptime(child_config[CONF_BIRTHDAY], "%Y-%m-%d").date()
+        percentage = max(
+            MIN_PERCENTAGE,
+            min(MAX_PERCENTAGE, child_config.get(CONF_PERCENTAGE, DEFAULT_PERCENTAGE)),
+        )
+
+        return cls(
+            name=name,
+            slug=child_slug(name),
+            birthday=birthday,
+            # Shared by every child born on the same day
+            birthday_iso=sys.intern(birthday.isoformat()),
+            percentage=percentage,
+            # Children with the same parameters share one compiled table
+            schedule=compile_schedule(AllowanceSchedule.from_config(child_config, percentage)),
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def child_slug(name: str) -> str:
+    """Return the slug used in a child's entity IDs."""
+    return name.lower().replace(' ', '_').replace('-', '_').replace('.', '_')
+
+
+def build_profiles(children: Iterable[Dict[str, Any]]) -> List[ChildProfile]:
+    """Build profiles for all children, skipping the ones with invalid config."""
+    profiles = []
+    for child in children:
+        try:
+            profiles.append(ChildProfile.from_config(child))
+        except ValueError:
+            _LOGGER.error(f"Invalid date format for {child[CONF_NAME]}: {child[CONF_BIRTHDAY]}")
+    return profiles
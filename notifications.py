@@ -0,0 +1,78 @@
+"""Birthday notifications for the Allowance Calculator integration."""
+import datetime
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import NOTIFICATION_ID_PREFIX, STORAGE_KEY_ANNOUNCED, STORAGE_VERSION
+from .calculator import format_allowance
+from .models import ChildProfile
+
+_LOGGER = logging.getLogger(__name__)
+
+SAVE_DELAY = 10
+
+
+class BirthdayNotifier:
+    """Announce each day's birthdays once, in a single notification."""
+
+    def __init__(self, hass: HomeAssistant, currency: str):
+        """Initialize the notifier."""
+        self.hass = hass
+        self.currency = currency
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY_ANNOUNCED)
+        self._date: Optional[str] = None
+        self._announced: List[str] = []
+
+    async def async_load(self) -> None:
+        """Load the children already announced today."""
+        stored = await self._store.async_load()
+        if stored:
+            self._date = stored["date"]
+            self._announced = stored["announced"]
+
+    @callback
+    def async_announce(
+        self,
+        current_date: datetime.date,
+        birthdays: List[Tuple[ChildProfile, Dict[str, Any]]],
+    ) -> None:
+        """Create or update the notification for the day's birthdays."""
+        date = current_date.isoformat()
+        if date != self._date:
+            self._date = date
+            self._announced = []
+        
+        new = [profile.slug for profile, _ in birthdays if profile.slug not in self._announced]
+        if not new:
+            return
+        
+        lines = []
+        for profile, child_data in birthdays:
+            new_allowance = format_allowance(child_data["allowance"], self.currency)
+            if profile.slug in new:
+                _LOGGER.info(f"It's {profile.name}'s birthday! New allowance: {new_allowance}")
+            lines.append(f"It's {profile.name}'s birthday! New weekly allowance: {new_allowance}")
+        
+        if len(birthdays) == 1:
+            title = f"Allowance Update for {birthdays[0][0].name}"
+        else:
+            title = f"Allowance Updates for {len(birthdays)} Birthdays"
+        
+        persistent_notification.async_create(
+            self.hass,
+            "\n".join(lines),
+            title=title,
+            notification_id=f"{NOTIFICATION_ID_PREFIX}_{date}",
+        )
+        
+        self._announced.extend(new)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data to store."""
+        return {"date": self._date, "announced": self._announced}
@@ -0,0 +1,126 @@
+"""Bulk roster import for the Allowance Calculator integration."""
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from homeassistant.const import CONF_NAME
+
+from .const import CONF_BIRTHDAY, CONF_PERCENTAGE, DEFAULT_PERCENTAGE
+from .calculator import validate_birthday, validate_percentage
+from .models import child_slug
+
+
+def parse_roster(lines: Iterable[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Parse and validate a CSV, JSON or JSON Lines roster in a single pass.
+
+    Returns the children and a list of every problem found, so all of them
+    can be reported at once.
+    """
+    lines = iter(lines)
+    first = ""
+    for first in lines:
+        if first.strip():
+            break
+    
+    start = first.lstrip()[:1]
+    if start == "[":
+        rows = _json_rows(first, lines)
+    elif start == "{":
+        rows = _json_lines_rows(first, lines)
+    else:
+        rows = _csv_rows(first, lines)
+    
+    children: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    slugs = set()
+    try:
+        for number, row in rows:
+            child, row_errors = _validate_row(row)
+            slug = child_slug(child.get(CONF_NAME, ""))
+            if slug and slug in slugs:
+                row_errors.append(f"duplicate name {child[CONF_NAME]!r}")
+            if row_errors:
+                errors.append(f"Row {number}: {', '.join(row_errors)}")
+                continue
+            slugs.add(slug)
+            children.append(child)
+    except UnicodeDecodeError:
+        # Left to the caller, which knows where the lines come from
+        raise
+    except ValueError as e:
+        errors.append(str(e))
+    
+    if not children and not errors:
+        errors.append("No children found")
+    return children, errors
+
+
+def _validate_row(row: Any) -> Tuple[Dict[str, Any], List[str]]:
+    """Validate a single row with the same rules as the add child step."""
+    if not isinstance(row, dict):
+        return {}, ["not an object"]
+    
+    errors = []
+    name = str(row.get(CONF_NAME) or "").strip()
+    if not name:
+        errors.append("missing name")
+    
+    birthday = str(row.get(CONF_BIRTHDAY) or "").strip()
+    if not validate_birthday(birthday):
+        errors.append(f"invalid birthday {birthday!r}")
+    
+    percentage = row.get(CONF_PERCENTAGE)
+    if percentage is None or percentage == "":
+        percentage = DEFAULT_PERCENTAGE
+    try:
+        percentage = float(percentage)
+    except (TypeError, ValueError):
+        errors.append(f"invalid percentage {percentage!r}")
+    else:
+        if not validate_percentage(percentage):
+            errors.append(f"percentage {percentage:g} is out of range")
+    
+    child = {CONF_NAME: name, CONF_BIRTHDAY: birthday, CONF_PERCENTAGE: percentage}
+    return child, errors
+
+
+def _csv_rows(header: str, lines: Iterator[str]) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Yield the rows of a CSV roster with a header line."""
+    reader = csv.DictReader(_chain(header, lines), skipinitialspace=True)
+    fieldnames = [field.strip().lower() for field in reader.fieldnames or []]
+    missing = {CONF_NAME, CONF_BIRTHDAY} - set(fieldnames)
+    if missing:
+        raise ValueError(f"The header is missing the columns: {', '.join(sorted(missing))}")
+    reader.fieldnames = fieldnames
+    
+    for row in reader:
+        if any(row.values()):
+            yield reader.line_num, row
+
+
+def _json_lines_rows(first: str, lines: Iterator[str]) -> Iterator[Tuple[int, Any]]:
+    """Yield the rows of a roster with one JSON object per line."""
+    for number, line in enumerate(_chain(first, lines), 1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError:
+            yield number, None
+
+
+def _json_rows(first: str, lines: Iterator[str]) -> Iterator[Tuple[int, Any]]:
+    """Yield the rows of a roster that is a JSON array."""
+    try:
+        rows = json.loads("".join(_chain(first, lines)))
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON: {e}") from e
+    if not isinstance(rows, list):
+        raise ValueError("The JSON roster must be a list of children")
+    yield from enumerate(rows, 1)
+
+
+def _chain(first: str, lines: Iterator[str]) -> Iterator[str]:
+    """Put the line that was peeked at back in front of the others."""
+    yield first
+    yield from lines
@@ -0,0 +1,95 @@
+"""Tiered allowance rules for the Allowance Calculator integration."""
+import functools
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from .const import (
+    CONF_BRACKETS,
+    CONF_CAP,
+    CONF_MIN_AGE,
+    CONF_OVERRIDES,
+    CONF_STEP,
+    MAX_SCHEDULE_AGE,
+    MIN_AGE_FOR_ALLOWANCE,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class AllowanceSchedule:
+    """The parameters of an allowance schedule.
+
+    The percentage of age applies from ``min_age``, or from the highest
+    bracket whose start age has been reached. ``step`` adds a fixed amount for
+    every year above ``min_age``, ``cap`` limits the result and ``overrides``
+    pin exact amounts for specific ages.
+    """
+
+    percentage: float
+    min_age: int = MIN_AGE_FOR_ALLOWANCE
+    brackets: Tuple[Tuple[int, float], ...] = ()
+    step: float = 0.0
+    cap: Optional[float] = None
+    overrides: Tuple[Tuple[int, float], ...] = ()
+
+    @classmethod
+    def from_config(cls, child_config: Dict[str, Any], percentage: float) -> "AllowanceSchedule":
+        """Build a schedule from a child's config."""
+        cap = child_config.get(CONF_CAP)
+        return cls(
+            percentage=percentage,
+            min_age=int(child_config.get(CONF_MIN_AGE, MIN_AGE_FOR_ALLOWANCE)),
+            brackets=tuple(sorted(
+                (int(age), float(bracket_percentage))
+                for age, bracket_percentage in child_config.get(CONF_BRACKETS, {}).items()
+            )),
+            step=float(child_config.get(CONF_STEP, 0.0)),
+            cap=float(cap) if cap is not None else None,
+            overrides=tuple(sorted(
+                (int(age), float(amount))
+                for age, amount in child_config.get(CONF_OVERRIDES, {}).items()
+            )),
+        )
+
+    def calculate(self, age: int) -> float:
+        """Calculate the allowance for an age from the schedule's rules, never below 0."""
+        for override_age, amount in self.overrides:
+            if override_age == age:
+                return max(0.0, amount)
+
+        if age < self.min_age:
+            return 0.0
+
+        percentage = self.percentage
+        for bracket_age, bracket_percentage in self.brackets:
+            if age >= bracket_age:
+                percentage = bracket_percentage
+
+        amount = age * percentage / 100
+        if self.step:
+            amount += self.step * (age - self.min_age)
+        if self.cap is not None:
+            amount = min(amount, self.cap)
+        return round(max(0.0, amount), 2)
+
+
+class AllowanceTable:
+    """A schedule compiled into a lookup table indexed by age."""
+
+    __slots__ = ("schedule", "amounts")
+
+    def __init__(self, schedule: AllowanceSchedule):
+        """Compile the schedule for ages 0 up to MAX_SCHEDULE_AGE."""
+        self.schedule = schedule
+        self.amounts = tuple(schedule.calculate(age) for age in range(MAX_SCHEDULE_AGE + 1))
+
+    def allowance(self, age: int) -> float:
+        """Return the allowance for an age."""
+        if 0 <= age <= MAX_SCHEDULE_AGE:
+            return self.amounts[age]
+        return self.schedule.calculate(age)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_schedule(schedule: AllowanceSchedule) -> AllowanceTable:
+    """Return the shared lookup table for a schedule."""
+    return AllowanceTable(schedule)
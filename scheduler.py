@@ -0,0 +1,79 @@
+"""Cooperative scheduling for the Allowance Calculator integration."""
+import asyncio
+import time
+from typing import Callable, Iterable, List, Sequence, TypeVar
+
+from homeassistant.core import HomeAssistant
+
+from .const import DEFAULT_SLICE_BUDGET_MS
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+class CooperativeScheduler:
+    """Process items in slices bounded by a time budget.
+
+    Between slices control goes back to the event loop, so a large roster
+    never holds up other integrations' callbacks for longer than the
+    budget. Work that is mapped over items can go to Home Assistant's
+    executor pool instead, with the results merged back on the loop.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        budget_ms: float = DEFAULT_SLICE_BUDGET_MS,
+        use_executor: bool = False,
+    ):
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.budget_ms = budget_ms
+        self.use_executor = use_executor
+        self.slices = 0
+        self.max_slice_ms = 0.0
+        self.executor_time_ms = 0.0
+
+    def reset_stats(self) -> None:
+        """Start counting for a new update cycle."""
+        self.slices = 0
+        self.max_slice_ms = 0.0
+        self.executor_time_ms = 0.0
+
+    async def async_run(self, items: Iterable[_T], work: Callable[[_T], None]) -> None:
+        """Call work for every item, yielding to the loop whenever the budget runs out."""
+        budget = self.budget_ms / 1000
+        slice_start = time.perf_counter()
+        for item in items:
+            work(item)
+            elapsed = time.perf_counter() - slice_start
+            if elapsed >= budget:
+                self._end_slice(elapsed)
+                await asyncio.sleep(0)
+                slice_start = time.perf_counter()
+        self._end_slice(time.perf_counter() - slice_start)
+
+    async def async_map(self, func: Callable[[_T], _R], items: Sequence[_T]) -> List[_R]:
+        """Apply func to every item in the executor, or in slices on the loop."""
+        if not items:
+            return []
+        
+        if self.use_executor:
+            start = time.perf_counter()
+            results = await self.hass.async_add_executor_job(_map, func, items)
+            self.executor_time_ms += (time.perf_counter() - start) * 1000
+            return results
+        
+        results: List[_R] = []
+        await self.async_run(items, lambda item: results.append(func(item)))
+        return results
+
+    def _end_slice(self, elapsed: float) -> None:
+        """Record a slice of work done on the loop."""
+        self.slices += 1
+        self.max_slice_ms = max(self.max_slice_ms, elapsed * 1000)
+
+
+def _map(func: Callable[[_T], _R], items: Sequence[_T]) -> List[_R]:
+    """Apply func to every item."""
+    return [func(item) for item in items]
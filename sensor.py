@@ -1,30 +1,35 @@
 """Sensor platform for allowance calculator."""
 import logging
-import datetime
 from typing import Optional, List
 
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorDeviceClass,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_time_change
-from homeassistant.const import CONF_NAME
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 from .const import (
     DOMAIN,
-    CONF_CHILDREN,
-    CONF_BIRTHDAY,
-    CONF_PERCENTAGE,
-    DEFAULT_PERCENTAGE,
-    DEFAULT_CURRENCY,
     ICON,
     ICON_BIRTHDAY,
+    ICON_DIAGNOSTICS,
+    ICON_ROSTER,
+    ENTITY_CHUNK_SIZE,
+    SIGNAL_CHILDREN_ADDED,
+    CONF_EXCLUDE_VOLATILE_ATTRIBUTES,
+    VOLATILE_ATTRIBUTES,
 )
-from .calculator import calculate_age, calculate_allowance, format_allowance
+from .attributes import date_strings
+from .calculator import format_allowance
+from .coordinator import AllowanceCoordinator
+from .models import ChildProfile
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,16 +43,56 @@ async def async_setup_entry(
     if config_entry.entry_id not in hass.data[DOMAIN]:
         return
 
-    config_data = hass.data[DOMAIN][config_entry.entry_id]
-    children = config_data.get(CONF_CHILDREN, [])
-    currency = config_data.get("currency", DEFAULT_CURRENCY)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    if config_entry.options.get(CONF_EXCLUDE_VOLATILE_ATTRIBUTES, False):
+        allowance_sensor_class = UnrecordedAllowanceSensor
+    else:
+        allowance_sensor_class = AllowanceSensor
     
-    sensors = []
-    for child in children:
-        sensors.append(AllowanceSensor(child, currency, config_entry.entry_id))
-        sensors.append(BirthdayCountdownSensor(child, config_entry.entry_id))
+    @callback
+    def async_add_children(profiles: List[ChildProfile]) -> None:
+        """Add the sensors of children added through the options."""
+        _async_add_child_sensors(
+            coordinator, profiles, allowance_sensor_class, config_entry.entry_id, async_add_entities
+        )
     
-    async_add_entities(sensors, True)
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_CHILDREN_ADDED.format(config_entry.entry_id), async_add_children
+        )
+    )
+    
+    _async_add_child_sensors(
+        coordinator, coordinator.profiles, allowance_sensor_class, config_entry.entry_id, async_add_entities
+    )
+    async_add_entities([
+        RosterSensor(coordinator, config_entry.entry_id),
+        UpdateDurationSensor(coordinator, config_entry.entry_id),
+    ])
+
+
+@callback
+def _async_add_child_sensors(
+    coordinator: AllowanceCoordinator,
+    profiles: List[ChildProfile],
+    allowance_sensor_class: type,
+    entry_id: str,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add the sensors of children in chunks, sharing one device info per child."""
+    for start in range(0, len(profiles), ENTITY_CHUNK_SIZE):
+        sensors = []
+        for profile in profiles[start:start + ENTITY_CHUNK_SIZE]:
+            device_info = DeviceInfo(
+                identifiers={(DOMAIN, f"{entry_id}_{profile.slug}")},
+                name=profile.name,
+                manufacturer="Allowance Calculator",
+                model="Child Tracker",
+                sw_version="1.0.0",
+            )
+            sensors.append(allowance_sensor_class(coordinator, profile, device_info))
+            sensors.append(BirthdayCountdownSensor(coordinator, profile, device_info))
+        async_add_entities(sensors)
 
 
 async def async_setup_platform(
@@ -60,61 +105,29 @@ async def async_setup_platform(
     if DOMAIN not in hass.data:
         return
     
-    children = hass.data[DOMAIN].get("children", [])
-    currency = hass.data[DOMAIN].get("currency", DEFAULT_CURRENCY)
+    coordinator = hass.data[DOMAIN].get("coordinator")
+    if coordinator is None:
+        return
     
     sensors = []
-    for child in children:
-        sensors.append(AllowanceSensor(child, currency))
-        sensors.append(BirthdayCountdownSensor(child))
+    for profile in coordinator.profiles:
+        sensors.append(AllowanceSensor(coordinator, profile))
+        sensors.append(BirthdayCountdownSensor(coordinator, profile))
     
-    async_add_entities(sensors, True)
+    async_add_entities(sensors)
 
 
-class AllowanceSensor(SensorEntity):
-    """Representation of an Allowance Calculator sensor."""
+class AllowanceCalculatorSensor(CoordinatorEntity[AllowanceCoordinator], SensorEntity):
+    """Base for the sensors that only write their state when it changed."""
 
-    def __init__(self, child_config, currency, entry_id=None):
+    def __init__(self, coordinator):
         """Initialize the sensor."""
-        self._name = child_config[CONF_NAME]
-        try:
-            self._birthday = datetime.datetime.strptime(
-                child_config[CONF_BIRTHDAY], "%Y-%m-%d"
-            ).date()
-        except ValueError as e:
-            _LOGGER.error(f"Invalid date format for {self._name}: {child_config[CONF_BIRTHDAY]}")
-            raise e
-            
-        self._percentage = max(0, min(100, child_config.get(CONF_PERCENTAGE, DEFAULT_PERCENTAGE)))
-        self._currency = currency
-        self._entry_id = entry_id
+        super().__init__(coordinator)
         self._state = None
+        # What was last written, a failed update changes only this
+        self._available = True
         self._attributes = {}
         
-        clean_name = self._name.lower().replace(' ', '_').replace('-', '_').replace('.', '_')
-        
-        # HOME ASSISTANT STANDARD WAY
-        self._attr_has_entity_name = True
-        self._attr_name = "Allowance"
-        self._attr_unique_id = f"allowance_{clean_name}"
-        self._attr_device_class = SensorDeviceClass.MONETARY
-        self._attr_native_unit_of_measurement = self._currency
-        self._attr_icon = ICON
-        
-    @property
-    def device_info(self) -> DeviceInfo | None:
-        """Return device information."""
-        if self._entry_id:
-            clean_name = self._name.lower().replace(' ', '_')
-            return DeviceInfo(
-                identifiers={(DOMAIN, f"{self._entry_id}_{clean_name}")},
-                name=self._name,  # This becomes the device name
-                manufacturer="Allowance Calculator",
-                model="Child Tracker",
-                sw_version="1.0.0",
-            )
-        return None
-        
     @property
     def native_value(self):
         """Return the state of the sensor."""
@@ -125,152 +138,211 @@ class AllowanceSensor(SensorEntity):
         """Return the state attributes."""
         return self._attributes
         
-    def update(self):
-        """Update the sensor."""
-        try:
-            age = calculate_age(self._birthday)
-            allowance = calculate_allowance(age, self._percentage)
-            next_age = age + 1 if self._is_birthday_today() else age + 1
-            next_allowance = calculate_allowance(next_age, self._percentage)
-            
-            self._state = allowance
-            self._attributes = {
-                "age": age,
-                "birthday": self._birthday.strftime("%Y-%m-%d"),
-                "percentage": self._percentage,
-                "formatted_value": format_allowance(allowance, self._currency),
-                "days_until_birthday": self._days_until_birthday(),
-                "next_allowance": next_allowance,
-                "currency": self._currency,
-                "is_birthday_today": self._is_birthday_today(),
-            }
-            
-        except Exception as e:
-            _LOGGER.error(f"Error updating sensor for {self._name}: {e}")
-            
-    def _days_until_birthday(self):
-        """Calculate days until next birthday."""
-        today = datetime.date.today()
-        next_birthday = self._birthday.replace(year=today.year)
-        if next_birthday < today:
-            next_birthday = next_birthday.replace(year=today.year + 1)
-        return (next_birthday - today).days
+    def _update_from_coordinator(self):
+        """Update the state and attributes from the coordinator's data."""
+        raise NotImplementedError
         
-    def _is_birthday_today(self):
-        """Check if today is the birthday."""
-        today = datetime.date.today()
-        return (today.month == self._birthday.month and 
-                today.day == self._birthday.day)
+    def _set_attributes(self, attributes):
+        """Replace the attributes unless they are unchanged, so a refresh holds on to no new dicts."""
+        if attributes != self._attributes:
+            self._attributes = attributes
 
-    async def async_added_to_hass(self):
-        """When entity is added to hass."""
-        await super().async_added_to_hass()
-        async_track_time_change(
-            self.hass, self._handle_time_changed, hour=0, minute=0, second=0
-        )
-        self.update()
-        
     @callback
-    def _handle_time_changed(self, now):
-        """Handle time changed."""
-        self.schedule_update_ha_state(True)
+    def _handle_coordinator_update(self):
+        """Handle updated data from the coordinator."""
+        previous = (self._available, self._state, self._attributes)
+        self._available = self.available
+        self._update_from_coordinator()
+        if (self._available, self._state, self._attributes) == previous:
+            self.coordinator.async_record_state_write(False)
+            return
+        self.coordinator.async_record_state_write(True)
+        super()._handle_coordinator_update()
 
 
-class BirthdayCountdownSensor(SensorEntity):
-    """Sensor for counting down days until birthday."""
+class AllowanceSensor(AllowanceCalculatorSensor):
+    """Representation of an Allowance Calculator sensor."""
 
-    def __init__(self, child_config, entry_id=None):
-        """Initialize the birthday countdown sensor."""
-        self._name = child_config[CONF_NAME]
-        try:
-            self._birthday = datetime.datetime.strptime(
-                child_config[CONF_BIRTHDAY], "%Y-%m-%d"
-            ).date()
-        except ValueError as e:
-            _LOGGER.error(f"Invalid date format for {self._name}: {child_config[CONF_BIRTHDAY]}")
-            raise e
+    def __init__(self, coordinator, profile: ChildProfile, device_info: Optional[DeviceInfo] = None):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._profile = profile
+        self._name = profile.name
         
-        self._entry_id = entry_id
-        self._state = None
-        self._attributes = {}
+        # HOME ASSISTANT STANDARD WAY
+        self._attr_has_entity_name = True
+        self._attr_name = "Allowance"
+        self._attr_unique_id = f"allowance_{profile.slug}"
+        self._attr_device_class = SensorDeviceClass.MONETARY
+        self._attr_native_unit_of_measurement = coordinator.currency
+        self._attr_icon = ICON
+        self._attr_device_info = device_info
+        
+        # Compute the initial state up front so no update pass is needed when added
+        self._update_from_coordinator()
         
-        clean_name = self._name.lower().replace(' ', '_').replace('-', '_').replace('.', '_')
+    def _update_from_coordinator(self):
+        """Update the sensor from the coordinator's data."""
+        data = self.coordinator.data.get(self._profile.slug) if self.coordinator.data else None
+        if data is None:
+            return
+        
+        allowance = data["allowance"]
+        currency = self.coordinator.currency
+        self._state = allowance
+        self._attr_native_unit_of_measurement = currency
+        attributes = {
+            "age": data["age"],
+            "birthday": data["birthday"],
+            "percentage": data["percentage"],
+            "formatted_value": format_allowance(allowance, currency),
+            "days_until_birthday": data["days_until_birthday"],
+            "next_allowance": data["next_allowance"],
+            "currency": currency,
+            "is_birthday_today": data["is_birthday"],
+            "total_earned": data["total_earned"],
+            "earned_this_year": data["earned_this_year"],
+            "projected_until_18": data["projected_until_18"],
+        }
+        if self.coordinator.ledger is not None:
+            attributes["paid_total"] = self.coordinator.ledger.balance(self._profile.slug)
+        self._set_attributes(attributes)
+
+
+class UnrecordedAllowanceSensor(AllowanceSensor):
+    """Allowance sensor that keeps its daily and weekly changing attributes out of the recorder."""
+
+    _unrecorded_attributes = VOLATILE_ATTRIBUTES
+
+
+class BirthdayCountdownSensor(AllowanceCalculatorSensor):
+    """Sensor for counting down days until birthday."""
+
+    def __init__(self, coordinator, profile: ChildProfile, device_info: Optional[DeviceInfo] = None):
+        """Initialize the birthday countdown sensor."""
+        super().__init__(coordinator)
+        self._profile = profile
+        self._name = profile.name
         
         # HOME ASSISTANT STANDARD WAY
         self._attr_has_entity_name = True
         self._attr_name = "Birthday Countdown"
-        self._attr_unique_id = f"birthday_countdown_{clean_name}"
+        self._attr_unique_id = f"birthday_countdown_{profile.slug}"
         self._attr_native_unit_of_measurement = "days"
         self._attr_icon = ICON_BIRTHDAY
+        self._attr_device_info = device_info
         
-    @property
-    def device_info(self) -> DeviceInfo | None:
-        """Return device information."""
-        if self._entry_id:
-            clean_name = self._name.lower().replace(' ', '_')
-            return DeviceInfo(
-                identifiers={(DOMAIN, f"{self._entry_id}_{clean_name}")},
-                name=self._name,  # Same device as allowance sensor
-                manufacturer="Allowance Calculator",
-                model="Child Tracker",
-                sw_version="1.0.0",
-            )
-        return None
+        self._update_from_coordinator()
+        
+    def _update_from_coordinator(self):
+        """Update the sensor from the coordinator's data."""
+        data = self.coordinator.data.get(self._profile.slug) if self.coordinator.data else None
+        if data is None:
+            return
+        
+        days_until = data["days_until_birthday"]
+        next_birthday, weekday = date_strings(data["next_birthday"])
+        
+        self._state = days_until
+        self._set_attributes({
+            "current_age": data["age"],
+            "birthday": data["birthday"],
+            "next_birthday": next_birthday,
+            "is_birthday_today": days_until == 0,
+            "birthday_weekday": weekday,
+            "next_age": data["next_age"],
+        })
+
+
+class RosterSensor(AllowanceCalculatorSensor):
+    """Sensor summarizing all children of a config entry in one state."""
+
+    # The children are already recorded through their own sensors
+    _unrecorded_attributes = frozenset({"children"})
+
+    def __init__(self, coordinator, entry_id):
+        """Initialize the roster sensor."""
+        super().__init__(coordinator)
+        
+        self._attr_name = "Allowance Roster"
+        self._attr_unique_id = f"{entry_id}_roster"
+        self._attr_device_class = SensorDeviceClass.MONETARY
+        self._attr_native_unit_of_measurement = coordinator.currency
+        self._attr_icon = ICON_ROSTER
+        
+        self._update_from_coordinator()
+        
+    def _update_from_coordinator(self):
+        """Update the roster from the coordinator's data."""
+        data = self.coordinator.data
+        if data is None:
+            return
+        
+        currency = self.coordinator.currency
+        children = []
+        total = 0.0
+        next_birthday = None
+        for profile in self.coordinator.profiles:
+            child_data = data.get(profile.slug)
+            if child_data is None:
+                continue
+            
+            allowance = child_data["allowance"]
+            days_until = child_data["days_until_birthday"]
+            total += allowance
+            children.append({
+                "name": profile.name,
+                "allowance": allowance,
+                "formatted_value": format_allowance(allowance, currency),
+                "days_until_birthday": days_until,
+            })
+            if next_birthday is None or days_until < next_birthday[1]:
+                next_birthday = (profile.name, days_until)
+        
+        total = round(total, 2)
+        self._state = total
+        self._attr_native_unit_of_measurement = currency
+        self._set_attributes({
+            "children": children,
+            "child_count": len(children),
+            "total_allowance": total,
+            "formatted_total": format_allowance(total, currency),
+            "next_birthday_name": next_birthday[0] if next_birthday else None,
+            "next_birthday_days": next_birthday[1] if next_birthday else None,
+            "currency": currency,
+        })
+
+
+class UpdateDurationSensor(SensorEntity):
+    """Debug sensor exposing how long the last update cycle took."""
+
+    def __init__(self, coordinator, entry_id):
+        """Initialize the update duration sensor."""
+        self.coordinator = coordinator
+        
+        self._attr_should_poll = False
+        self._attr_name = "Allowance Calculator Update Duration"
+        self._attr_unique_id = f"{entry_id}_update_duration"
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_entity_registry_enabled_default = False
+        self._attr_icon = ICON_DIAGNOSTICS
         
     @property
     def native_value(self):
-        """Return the state of the sensor."""
-        return self._state
+        """Return the duration of the last update cycle."""
+        return self.coordinator.stats.last_duration_ms
         
     @property
     def extra_state_attributes(self):
-        """Return the state attributes."""
-        return self._attributes
-        
-    def update(self):
-        """Update the sensor."""
-        try:
-            today = datetime.date.today()
-            age = calculate_age(self._birthday, today)
-            days_until = self._days_until_birthday()
-            next_birthday = self._get_next_birthday_date()
-            
-            self._state = days_until
-            self._attributes = {
-                "current_age": age,
-                "birthday": self._birthday.strftime("%Y-%m-%d"),
-                "next_birthday": next_birthday.strftime("%Y-%m-%d"),
-                "is_birthday_today": days_until == 0,
-                "birthday_weekday": next_birthday.strftime("%A"),
-                "next_age": age + 1 if days_until == 0 else age + 1,
-            }
-            
-        except Exception as e:
-            _LOGGER.error(f"Error updating birthday countdown for {self._name}: {e}")
-            
-    def _days_until_birthday(self):
-        """Calculate days until next birthday."""
-        today = datetime.date.today()
-        next_birthday = self._get_next_birthday_date()
-        return (next_birthday - today).days
-        
-    def _get_next_birthday_date(self):
-        """Get the next birthday date."""
-        today = datetime.date.today()
-        next_birthday = self._birthday.replace(year=today.year)
-        if next_birthday < today:
-            next_birthday = next_birthday.replace(year=today.year + 1)
-        return next_birthday
+        """Return the update counters."""
+        return self.coordinator.stats.as_dict()
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
         await super().async_added_to_hass()
-        async_track_time_change(
-            self.hass, self._handle_time_changed, hour=0, minute=0, second=0
+        self.async_on_remove(
+            self.coordinator.async_add_stats_listener(self.async_write_ha_state)
         )
-        self.update()
-        
-    @callback
-    def _handle_time_changed(self, now):
-        """Handle time changed."""
-        self.schedule_update_ha_state(True)
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""Services for the Allowance Calculator integration."""
+import datetime
+import functools
+import logging
+from typing import Any, Dict, List, Tuple
+
+import voluptuous as vol
+
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    CONF_BRACKETS,
+    CONF_CAP,
+    CONF_MIN_AGE,
+    CONF_OVERRIDES,
+    CONF_PERCENTAGE,
+    CONF_STEP,
+    MAX_PERCENTAGE,
+    MIN_PERCENTAGE,
+    SIMULATION_CHUNK_SIZE,
+)
+from .calculator import get_child_earnings_data
+from .coordinator import AllowanceCoordinator
+from .models import ChildProfile
+from .simulation import summarize, weeks_chunk, with_changes
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_GET_EARNINGS = "get_earnings"
+SERVICE_MARK_PAID = "mark_paid"
+SERVICE_ADJUST = "adjust"
+SERVICE_SIMULATE = "simulate"
+
+ATTR_AMOUNT = "amount"
+ATTR_DATE = "date"
+ATTR_END_DATE = "end_date"
+ATTR_LIMIT = "limit"
+ATTR_MODE = "mode"
+ATTR_NOTE = "note"
+ATTR_OFFSET = "offset"
+ATTR_START_DATE = "start_date"
+
+MODE_SUMMARY = "summary"
+MODE_WEEKS = "weeks"
+
+GET_EARNINGS_SCHEMA = vol.Schema({
+    vol.Optional(CONF_NAME): cv.string,
+    vol.Optional(ATTR_DATE): cv.date,
+})
+
+MARK_PAID_SCHEMA = vol.Schema({
+    vol.Required(CONF_NAME): cv.string,
+    vol.Optional(ATTR_AMOUNT): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(ATTR_NOTE): cv.string,
+})
+
+ADJUST_SCHEMA = vol.Schema({
+    vol.Required(CONF_NAME): cv.string,
+    vol.Required(ATTR_AMOUNT): vol.Coerce(float),
+    vol.Optional(ATTR_NOTE): cv.string,
+})
+
+SIMULATE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_START_DATE): cv.date,
+    vol.Required(ATTR_END_DATE): cv.date,
+    vol.Optional(CONF_NAME): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(CONF_PERCENTAGE): vol.All(
+        vol.Coerce(float), vol.Range(min=MIN_PERCENTAGE, max=MAX_PERCENTAGE)
+    ),
+    vol.Optional(CONF_MIN_AGE): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional(CONF_BRACKETS): {
+        vol.All(vol.Coerce(int), vol.Range(min=0)):
+            vol.All(vol.Coerce(float), vol.Range(min=MIN_PERCENTAGE, max=MAX_PERCENTAGE)),
+    },
+    vol.Optional(CONF_STEP): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(CONF_CAP): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(CONF_OVERRIDES): {
+        vol.All(vol.Coerce(int), vol.Range(min=0)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    },
+    vol.Optional(ATTR_MODE, default=MODE_SUMMARY): vol.In([MODE_SUMMARY, MODE_WEEKS]),
+    vol.Optional(ATTR_OFFSET, default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional(ATTR_LIMIT, default=SIMULATION_CHUNK_SIZE): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=SIMULATION_CHUNK_SIZE)
+    ),
+})
+
+
+def async_get_coordinators(hass: HomeAssistant) -> List[AllowanceCoordinator]:
+    """Return the coordinators of the YAML setup and of all config entries."""
+    return [
+        value
+        for value in hass.data.get(DOMAIN, {}).values()
+        if isinstance(value, AllowanceCoordinator)
+    ]
+
+
+def _async_find_child(
+    hass: HomeAssistant, name: str
+) -> Tuple[AllowanceCoordinator, ChildProfile]:
+    """Find a child with a payout ledger by name."""
+    for coordinator in async_get_coordinators(hass):
+        if coordinator.ledger is None:
+            continue
+        for profile in coordinator.profiles:
+            if profile.name == name:
+                return coordinator, profile
+    raise HomeAssistantError(f"No child named {name} is set up through the UI")
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def async_get_earnings(call: ServiceCall) -> ServiceResponse:
+        """Return what each child has earned and will earn until 18."""
+        current_date: datetime.date = call.data.get(ATTR_DATE) or dt_util.now().date()
+        name = call.data.get(CONF_NAME)
+        
+        children: List[Dict[str, Any]] = []
+        for coordinator in async_get_coordinators(hass):
+            profiles = [
+                profile for profile in coordinator.profiles
+                if name is None or profile.name == name
+            ]
+            earnings = await coordinator.scheduler.async_map(
+                functools.partial(get_child_earnings_data, current_date=current_date), profiles
+            )
+            children.extend(
+                {"name": profile.name, "currency": coordinator.currency, **child_earnings}
+                for profile, child_earnings in zip(profiles, earnings)
+            )
+        
+        return {"date": current_date.isoformat(), "children": children}
+
+    async def async_mark_paid(call: ServiceCall) -> ServiceResponse:
+        """Record a payout, by default of the child's current allowance."""
+        coordinator, profile = _async_find_child(hass, call.data[CONF_NAME])
+        amount = call.data.get(ATTR_AMOUNT)
+        if amount is None:
+            child_data = coordinator.data.get(profile.slug)
+            if child_data is None:
+                raise HomeAssistantError(f"No allowance is known for {profile.name}")
+            amount = child_data["allowance"]
+        
+        balance = coordinator.ledger.async_mark_paid(profile.slug, amount, call.data.get(ATTR_NOTE))
+        coordinator.async_update_listeners()
+        return {"name": profile.name, "amount": amount, "paid_total": balance}
+
+    async def async_adjust(call: ServiceCall) -> ServiceResponse:
+        """Record a correction to what a child has been paid."""
+        coordinator, profile = _async_find_child(hass, call.data[CONF_NAME])
+        amount = call.data[ATTR_AMOUNT]
+        
+        balance = coordinator.ledger.async_adjust(profile.slug, amount, call.data.get(ATTR_NOTE))
+        coordinator.async_update_listeners()
+        return {"name": profile.name, "amount": amount, "paid_total": balance}
+
+    async def async_simulate(call: ServiceCall) -> ServiceResponse:
+        """Simulate the allowances over a date range, optionally with changed rules."""
+        start = call.data[ATTR_START_DATE]
+        end = call.data[ATTR_END_DATE]
+        if end < start:
+            raise HomeAssistantError("The end date must not be before the start date")
+        
+        changes: Dict[str, Any] = {}
+        for key in (CONF_PERCENTAGE, CONF_MIN_AGE, CONF_STEP, CONF_CAP):
+            if key in call.data:
+                changes[key] = call.data[key]
+        for key in (CONF_BRACKETS, CONF_OVERRIDES):
+            if key in call.data:
+                changes[key] = tuple(sorted(call.data[key].items()))
+        
+        names = call.data.get(CONF_NAME)
+        profiles = [
+            with_changes(profile, changes)
+            for coordinator in async_get_coordinators(hass)
+            for profile in coordinator.profiles
+            if names is None or profile.name in names
+        ]
+        
+        # Simulations over many years and children run in the executor
+        if call.data[ATTR_MODE] == MODE_WEEKS:
+            return await hass.async_add_executor_job(
+                weeks_chunk, profiles, start, end, call.data[ATTR_OFFSET], call.data[ATTR_LIMIT]
+            )
+        return await hass.async_add_executor_job(summarize, profiles, start, end)
+
+    if not hass.services.has_service(DOMAIN, SERVICE_GET_EARNINGS):
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_GET_EARNINGS,
+            async_get_earnings,
+            schema=GET_EARNINGS_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_MARK_PAID,
+            async_mark_paid,
+            schema=MARK_PAID_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_ADJUST,
+            async_adjust,
+            schema=ADJUST_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_SIMULATE,
+            async_simulate,
+            schema=SIMULATE_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
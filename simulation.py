@@ -0,0 +1,133 @@
+"""What-if simulations for the Allowance Calculator integration."""
+import dataclasses
+import datetime
+import itertools
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .calculator import age_periods, birthday_in_year, calculate_age, count_paydays, iter_paydays
+from .models import ChildProfile
+from .rules import compile_schedule
+
+
+def with_changes(profile: ChildProfile, changes: Dict[str, Any]) -> ChildProfile:
+    """Return a copy of a profile with changed schedule parameters.
+
+    The changes use the schedule's field names: percentage, min_age,
+    brackets, step, cap and overrides.
+    """
+    if not changes:
+        return profile
+    
+    schedule = dataclasses.replace(profile.schedule.schedule, **changes)
+    return dataclasses.replace(
+        profile, percentage=schedule.percentage, schedule=compile_schedule(schedule)
+    )
+
+
+def iter_weeks(
+    profiles: Iterable[ChildProfile], start: datetime.date, end: datetime.date, offset: int = 0
+) -> Iterator[Dict[str, Any]]:
+    """Yield every payday of every child from start up to and including end.
+
+    The first offset weeks are skipped, whole children at a time where
+    possible, without generating them.
+    """
+    end = end + datetime.timedelta(days=1)
+    for profile in profiles:
+        paydays: Iterator = iter_paydays(profile, start, end)
+        if offset:
+            count = count_paydays(max(start, profile.birthday), end)
+            if offset >= count:
+                offset -= count
+                continue
+            paydays = itertools.islice(paydays, offset, None)
+            offset = 0
+        
+        for payday, amount in paydays:
+            yield {
+                "name": profile.name,
+                "date": payday.isoformat(),
+                "age": calculate_age(profile.birthday, payday),
+                "allowance": amount,
+            }
+
+
+def iter_age_transitions(
+    profile: ChildProfile, start: datetime.date, end: datetime.date
+) -> Iterator[Dict[str, Any]]:
+    """Yield the birthdays from start up to and including end with the new allowance."""
+    birthday = profile.birthday
+    year = max(start.year, birthday.year + 1)
+    while year <= end.year:
+        anniversary = birthday_in_year(birthday, year)
+        if start <= anniversary <= end:
+            age = year - birthday.year
+            yield {
+                "date": anniversary.isoformat(),
+                "age": age,
+                "allowance": profile.schedule.allowance(age),
+            }
+        year += 1
+
+
+def summarize(
+    profiles: Iterable[ChildProfile], start: datetime.date, end: datetime.date
+) -> Dict[str, Any]:
+    """Summarize the simulation per child without keeping the weeks in memory."""
+    children: List[Dict[str, Any]] = []
+    total = 0.0
+    for profile in profiles:
+        weeks = 0
+        child_total = 0.0
+        first: Optional[float] = None
+        last: Optional[float] = None
+        # Weeks at the same age pay the same, so only the age periods are walked
+        for age, period_start, period_end in age_periods(
+            profile, start, end + datetime.timedelta(days=1)
+        ):
+            count = count_paydays(period_start, period_end)
+            if not count:
+                continue
+            amount = profile.schedule.allowance(age)
+            weeks += count
+            child_total += count * amount
+            if first is None:
+                first = amount
+            last = amount
+        
+        child_total = round(child_total, 2)
+        total += child_total
+        children.append({
+            "name": profile.name,
+            "percentage": profile.percentage,
+            "weeks": weeks,
+            "total": child_total,
+            "first_allowance": first,
+            "last_allowance": last,
+            "age_transitions": list(iter_age_transitions(profile, start, end)),
+        })
+    
+    return {
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "children": children,
+        "total": round(total, 2),
+    }
+
+
+def weeks_chunk(
+    profiles: Iterable[ChildProfile],
+    start: datetime.date,
+    end: datetime.date,
+    offset: int,
+    limit: int,
+) -> Dict[str, Any]:
+    """Return one chunk of the simulated weeks and the offset of the next one."""
+    chunk = list(itertools.islice(iter_weeks(profiles, start, end, offset), limit + 1))
+    more = len(chunk) > limit
+    return {
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "weeks": chunk[:limit],
+        "next_offset": offset + limit if more else None,
+    }
@@ -0,0 +1,22 @@
+"""Fixtures for the Allowance Calculator tests."""
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+# Home Assistant loads custom integrations from custom_components/<domain>,
+# while this repository is the integration itself
+_CUSTOM_COMPONENTS = Path(tempfile.mkdtemp(prefix="allowance_calculator_")) / "custom_components"
+_CUSTOM_COMPONENTS.mkdir()
+(_CUSTOM_COMPONENTS / "__init__.py").touch()
+(_CUSTOM_COMPONENTS / "allowance_calculator").symlink_to(Path(__file__).resolve().parent.parent)
+sys.path.insert(0, str(_CUSTOM_COMPONENTS.parent))
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable the integration in every test."""
+    yield
@@ -0,0 +1,91 @@
+"""Tests for the closed-form earnings of the Allowance Calculator."""
+import datetime
+import random
+
+import pytest
+
+from custom_components.allowance_calculator.calculator import (
+    calculate_age,
+    calculate_earnings,
+    get_child_earnings_data,
+)
+from custom_components.allowance_calculator.const import PAYDAY_WEEKDAY
+from custom_components.allowance_calculator.models import build_profiles
+
+CHILDREN = [
+    {"name": "Flat", "birthday": "2012-06-15", "percentage": 30},
+    {"name": "Leap", "birthday": "2012-02-29", "percentage": 40},
+    {"name": "New Year", "birthday": "2010-01-01", "percentage": 25},
+    {"name": "Friday", "birthday": "2015-05-01", "percentage": 30},
+    {
+        "name": "Tiered",
+        "birthday": "2008-12-31",
+        "percentage": 20,
+        "min_age": 4,
+        "brackets": {12: 40, 16: 55},
+        "step": 0.25,
+        "cap": 9,
+        "overrides": {18: 15},
+    },
+]
+
+
+def brute_force_earnings(profile, start, end):
+    """Add up the allowance paid on every payday from start up to, not including, end."""
+    total = 0.0
+    day = max(start, profile.birthday)
+    while day < end:
+        if day.weekday() == PAYDAY_WEEKDAY:
+            total += profile.schedule.allowance(calculate_age(profile.birthday, day))
+        day += datetime.timedelta(days=1)
+    return round(total, 2)
+
+
+def first_day_at_age(profile, age):
+    """Find the day a child reaches an age by trying each day."""
+    day = profile.birthday + datetime.timedelta(days=365 * age - 10)
+    while calculate_age(profile.birthday, day) < age:
+        day += datetime.timedelta(days=1)
+    return day
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_calculate_earnings_matches_brute_force(seed):
+    """Random ranges, including ones across birthdays and Feb 29, match a day by day sum."""
+    rng = random.Random(seed)
+    for profile in build_profiles(CHILDREN):
+        for _ in range(20):
+            start = profile.birthday + datetime.timedelta(days=rng.randrange(-400, 9000))
+            end = start + datetime.timedelta(days=rng.randrange(0, 3000))
+            assert calculate_earnings(profile, start, end) == pytest.approx(
+                brute_force_earnings(profile, start, end), abs=1e-9
+            ), (profile.name, start, end)
+
+
+def test_calculate_earnings_of_empty_and_reversed_ranges():
+    """Nothing is earned before the birthday or in an empty range."""
+    profile = build_profiles(CHILDREN)[0]
+    before = profile.birthday - datetime.timedelta(days=10)
+    assert calculate_earnings(profile, before, profile.birthday) == 0.0
+    assert calculate_earnings(profile, profile.birthday, profile.birthday) == 0.0
+    assert calculate_earnings(profile, datetime.date(2020, 5, 1), datetime.date(2020, 1, 1)) == 0.0
+
+
+def test_get_child_earnings_data_matches_brute_force():
+    """Earned to date, this year and until 18 match a day by day sum."""
+    rng = random.Random(42)
+    for profile in build_profiles(CHILDREN):
+        for _ in range(10):
+            current_date = profile.birthday + datetime.timedelta(days=rng.randrange(0, 9500))
+            tomorrow = current_date + datetime.timedelta(days=1)
+            projection_end = first_day_at_age(profile, 18)
+
+            data = get_child_earnings_data(profile, current_date)
+
+            assert data == pytest.approx({
+                "total_earned": brute_force_earnings(profile, profile.birthday, tomorrow),
+                "earned_this_year": brute_force_earnings(
+                    profile, datetime.date(current_date.year, 1, 1), tomorrow
+                ),
+                "projected_until_18": brute_force_earnings(profile, tomorrow, projection_end),
+            }, abs=1e-9), (profile.name, current_date)
@@ -0,0 +1,88 @@
+"""Tests for the long-term statistics of the Allowance Calculator."""
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import get_last_statistics
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.allowance_calculator.const import DOMAIN
+from custom_components.allowance_calculator.long_term_statistics import StatisticsPublisher
+
+CHILDREN = [
+    {"name": "Sammy Jr.", "birthday": "2014-05-05", "percentage": 30},
+    {"name": "A. Smith", "birthday": "2012-02-29", "percentage": 40},
+    {"name": "Zoë", "birthday": "2016-11-30", "percentage": 30},
+    {"name": "O'Brien", "birthday": "2010-01-01", "percentage": 20},
+]
+
+STATISTIC_IDS = {
+    "Sammy Jr.": "allowance_calculator:sammy_jr_earned",
+    "A. Smith": "allowance_calculator:a_smith_earned",
+    "Zoë": "allowance_calculator:zoe_earned",
+    "O'Brien": "allowance_calculator:o_brien_earned",
+}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(recorder_mock, enable_custom_integrations):
+    """Start the recorder before Home Assistant."""
+    yield
+
+
+async def _async_setup(hass):
+    """Set up an entry that publishes statistics and return its coordinator."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"children": CHILDREN, "currency": "EUR"},
+        options={"long_term_statistics": True},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+    return hass.data[DOMAIN][entry.entry_id]
+
+
+async def _async_last_sums(hass):
+    """Return the last earned sum of every child that has statistics."""
+    sums = {}
+    for name, statistic_id in STATISTIC_IDS.items():
+        last = await get_instance(hass).async_add_executor_job(
+            get_last_statistics, hass, 1, statistic_id, False, {"sum"}
+        )
+        if last.get(statistic_id):
+            sums[name] = last[statistic_id][0]["sum"]
+    return sums
+
+
+async def test_names_give_valid_statistic_ids(hass):
+    """Names with dots, accents and apostrophes are published."""
+    coordinator = await _async_setup(hass)
+
+    sums = await _async_last_sums(hass)
+    assert sums == {
+        profile.name: coordinator.data[profile.slug]["total_earned"]
+        for profile in coordinator.profiles
+    }
+
+
+async def test_rejected_child_does_not_stop_the_roster(hass, caplog):
+    """The other children are published when one child's rows are rejected."""
+    publish_earned = StatisticsPublisher._async_publish_earned
+
+    def reject_zoe(self, profile, current_date):
+        if profile.name == "Zoë":
+            raise HomeAssistantError("Invalid statistic_id")
+        publish_earned(self, profile, current_date)
+
+    with patch.object(StatisticsPublisher, "_async_publish_earned", reject_zoe):
+        await _async_setup(hass)
+
+    assert set(await _async_last_sums(hass)) == {"Sammy Jr.", "A. Smith", "O'Brien"}
+    assert "Error publishing the statistics of Zoë" in caplog.text
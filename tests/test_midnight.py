@@ -0,0 +1,182 @@
+"""Soak tests for the timers and listeners of the Allowance Calculator."""
+import datetime
+import gc
+import heapq
+import logging
+import tracemalloc
+from unittest import mock
+
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.helpers.entity_platform import DATA_ENTITY_PLATFORM
+from homeassistant.helpers.storage import Store
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from custom_components.allowance_calculator.const import DOMAIN
+from custom_components.allowance_calculator.coordinator import AllowanceCoordinator
+
+DAYS = 3 * 365 + 1
+RELOADS = 500
+
+CHILDREN = [
+    {"name": "Ann", "birthday": "2014-09-08"},
+    {"name": "Ben", "birthday": "2012-02-29"},
+    {"name": "Cas", "birthday": "2016-04-07"},
+    {"name": "Dee", "birthday": "2010-03-31"},
+]
+
+
+def _pending_timers(hass) -> int:
+    """Count the timers scheduled on the event loop."""
+    return sum(not handle.cancelled() for handle in hass.loop._scheduled)
+
+
+def _traced_memory() -> int:
+    """Return the memory in use, leaving out what the fake clock allocates."""
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, mock.__file__),
+        tracemalloc.Filter(False, "*/freezegun/*"),
+    ])
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+def _release_unloaded_entries(hass) -> None:
+    """Drop what the test harness, Home Assistant and asyncio keep of unloaded entries.
+
+    The mocked storage records every Store it was called with, Home Assistant
+    2024.3 leaves the platforms of unloaded entries registered, and asyncio
+    keeps cancelled timers, with the context they were armed in, until they
+    make up half of its queue.
+    """
+    for method in (Store._async_load, Store._async_write_data, Store.async_remove):
+        method.reset_mock()
+    platforms = hass.data[DATA_ENTITY_PLATFORM][DOMAIN]
+    platforms[:] = [platform for platform in platforms if platform.entities]
+    hass.loop._scheduled[:] = [handle for handle in hass.loop._scheduled if not handle.cancelled()]
+    heapq.heapify(hass.loop._scheduled)
+    hass.loop._timer_cancelled_count = 0
+
+
+async def _async_tick(hass, freezer, moment: datetime.datetime) -> None:
+    """Move the clock and run what is due."""
+    freezer.move_to(moment)
+    async_fire_time_changed(hass, moment)
+    await hass.async_block_till_done()
+
+
+@pytest.mark.parametrize(
+    "time_zone",
+    [
+        # DST starts and ends at night, away from midnight
+        "Europe/Amsterdam",
+        # DST starts at midnight, so some days have no 00:00
+        "America/Santiago",
+    ],
+)
+async def test_midnight_soak(hass, freezer, time_zone):
+    """Every day is updated exactly once for years, without leaking timers, listeners or memory."""
+    # Jumping the clock by hours would be reported as slow callbacks
+    hass.loop.set_debug(False)
+    hass.config.set_time_zone(time_zone)
+    day = datetime.date(2024, 1, 1)
+    freezer.move_to(dt_util.start_of_local_day(day) + datetime.timedelta(hours=12))
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: {"children": CHILDREN}})
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN]["coordinator"]
+
+    listeners = timers = bus_listeners = None
+    for elapsed in range(1, DAYS + 1):
+        day += datetime.timedelta(days=1)
+        start_of_day = dt_util.start_of_local_day(day)
+        cycles = coordinator.stats.cycles
+
+        # Nothing happens late in the previous day
+        await _async_tick(hass, freezer, start_of_day - datetime.timedelta(minutes=1))
+        assert coordinator.stats.cycles == cycles, day
+
+        await _async_tick(hass, freezer, start_of_day)
+        assert coordinator.current_date == day
+        assert coordinator.stats.cycles == cycles + 1, day
+
+        # Or later on the day itself, whatever the clocks do in the night
+        for hours in (1, 3, 12):
+            await _async_tick(hass, freezer, start_of_day + datetime.timedelta(hours=hours))
+        assert coordinator.stats.cycles == cycles + 1, day
+
+        for child in CHILDREN:
+            data = coordinator.data[child["name"].lower()]
+            assert data["days_until_birthday"] == (data["next_birthday"] - day).days
+
+        if elapsed == 365:
+            listeners = len(coordinator._listeners)
+            timers = _pending_timers(hass)
+            bus_listeners = hass.bus.async_listeners()
+            tracemalloc.start()
+            memory = _traced_memory()
+
+    grown = _traced_memory()
+    tracemalloc.stop()
+    assert len(coordinator._listeners) == listeners
+    assert _pending_timers(hass) == timers
+    assert hass.bus.async_listeners() == bus_listeners
+    # Keeping even one timestamp per day would add up to more than this
+    assert grown - memory < 64 * 1024
+
+
+async def test_birthday_on_a_day_without_midnight(hass, freezer):
+    """A child whose birthday starts without a 00:00 still gets their new allowance that day."""
+    hass.config.set_time_zone("America/Santiago")
+    freezer.move_to(datetime.datetime(2024, 9, 7, 12, tzinfo=dt_util.DEFAULT_TIME_ZONE))
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: {"children": CHILDREN[:1]}})
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.ann_allowance").attributes["age"] == 9
+
+    # Clocks jump from 00:00 to 01:00 on September 8
+    await _async_tick(hass, freezer, dt_util.start_of_local_day(datetime.date(2024, 9, 8)))
+
+    assert dt_util.now().hour == 1
+    assert hass.states.get("sensor.ann_allowance").attributes["age"] == 10
+
+
+async def test_reload_soak(hass, caplog):
+    """Reloading an entry hundreds of times leaves no timers, listeners or memory behind."""
+    hass.loop.set_debug(False)
+    # The captured log records of every reload would be kept until the end
+    caplog.set_level(logging.WARNING)
+    entry = MockConfigEntry(domain=DOMAIN, data={"children": CHILDREN, "currency": "EUR"})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    timers = bus_listeners = memory = None
+    for reload in range(1, RELOADS + 1):
+        assert await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        # One listener per child sensor and the roster, the duration sensor is disabled
+        assert len(coordinator._listeners) == 2 * len(CHILDREN) + 1
+        assert hass.states.get("sensor.ann_allowance").state != "unavailable"
+
+        _release_unloaded_entries(hass)
+        # The first reloads fill the caches and registries
+        if reload == 50:
+            timers = _pending_timers(hass)
+            bus_listeners = hass.bus.async_listeners()
+            tracemalloc.start()
+            memory = _traced_memory()
+
+    grown = _traced_memory()
+    tracemalloc.stop()
+    assert list(hass.data[DOMAIN]) == [entry.entry_id]
+    assert sum(isinstance(obj, AllowanceCoordinator) for obj in gc.get_objects()) == 1
+    assert _pending_timers(hass) == timers
+    assert hass.bus.async_listeners() == bus_listeners
+    # Keeping even the profiles of every reload would add up to more than this
+    assert grown - memory < 200 * 1024